@@ -24,6 +24,10 @@ class Config:
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
     CLAUDE_API_KEY = os.getenv("CLAUDE_API_KEY")
     OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+    # Client-side LLM rate limits (0 disables); keep at or below the provider account's limits
+    LLM_RPM = int(os.getenv("LLM_RPM", "500"))
+    LLM_TPM = int(os.getenv("LLM_TPM", "30000"))
+    LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "10"))
 
     # Database (Swappable: turso, postgres, sqlite) - Using SQLite for now, can swap to Turso later
     DB_TYPE = os.getenv("DB_TYPE", "sqlite")
@@ -60,6 +64,11 @@ class Config:
     EMAIL_FROM_NAME = os.getenv("EMAIL_FROM_NAME", "DaycareMoments")
     EMAIL_FROM_ADDRESS = os.getenv("EMAIL_FROM_ADDRESS", "noreply@daycaremoments.com")
 
+    # Authentication
+    # bcrypt cost (2^rounds iterations); 12 is bcrypt's default. Each step down halves
+    # login/registration CPU time - pick with `python -m scripts.calibrate_bcrypt`, minimum 10
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
     # Payments
     STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
     STRIPE_PUBLISHABLE_KEY = os.getenv("STRIPE_PUBLISHABLE_KEY")
@@ -71,10 +80,18 @@ class Config:
     ENABLE_VOICE_CALLING = os.getenv("ENABLE_VOICE_CALLING", "True").lower() == "true"
     ENABLE_SMS_NOTIFICATIONS = os.getenv("ENABLE_SMS_NOTIFICATIONS", "False").lower() == "true"
 
+    # Face recognition: detector ('hog' or 'cnn') and the longest image side it runs at (0 = full size).
+    # Downscaling speeds up detection on large uploads, but HOG misses faces under ~80px,
+    # so small faces in group shots can be lost; opt in per deployment
+    FACE_MODEL = os.getenv("FACE_MODEL", "hog")
+    FACE_DETECTION_MAX_SIDE = int(os.getenv("FACE_DETECTION_MAX_SIDE", "0"))
+
     # Limits
     PHOTO_RETENTION_DAYS = int(os.getenv("PHOTO_RETENTION_DAYS", "90"))
     MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
     MAX_FILES_PER_UPLOAD = int(os.getenv("MAX_FILES_PER_UPLOAD", "10"))
+    PHOTO_WORKERS = int(os.getenv("PHOTO_WORKERS", "8"))  # Photos processed concurrently per batch
+    PHOTO_COMMIT_BATCH = int(os.getenv("PHOTO_COMMIT_BATCH", "50"))  # Processed photos saved per transaction
 
     # Pricing Tiers
     PRICING_TIERS = {
@@ -119,6 +136,9 @@ class Config:
         if not cls.DATABASE_URL:
             errors.append("DATABASE_URL or TURSO_DB_URL is required")
 
+        if not 10 <= cls.BCRYPT_ROUNDS <= 31:
+            errors.append("BCRYPT_ROUNDS must be between 10 and 31")
+
         return errors
 
     @classmethod
@@ -1,16 +1,60 @@
 """Database connection manager"""
 import os
-from sqlalchemy import create_engine
+import json
+from functools import partial
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
 from app.config import Config
 from .models import Base
 
+# JSON columns (Person.face_encodings: lists of 128 floats per encoding) are
+# serialized on every write and parsed on every load; use orjson when installed,
+# otherwise compact stdlib json
+try:
+    import orjson
+    _json_serializer = lambda obj: orjson.dumps(obj).decode()
+    _json_deserializer = orjson.loads
+except ImportError:
+    _json_serializer = partial(json.dumps, separators=(',', ':'))
+    _json_deserializer = json.loads
+
 # Global session maker
 _SessionLocal = None
 _engine = None
 
 
+def _add_missing_columns(engine):
+    """
+    Add nullable model columns (and their indexes) missing from existing tables
+
+    create_all only creates missing tables, so databases created before a
+    column was added to a model would otherwise fail on every query that
+    selects it.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        missing = [column for column in table.columns if column.name not in existing_columns and column.nullable]
+        if not missing:
+            continue
+
+        with engine.begin() as conn:
+            for column in missing:
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+        missing_names = {column.name for column in missing}
+        for index in table.indexes:
+            if missing_names & {column.name for column in index.columns}:
+                index.create(bind=engine, checkfirst=True)
+
+
 def init_db():
     """Initialize database connection"""
     global _engine, _SessionLocal
@@ -28,6 +72,8 @@ def init_db():
         db_url,
         echo=False,  # Disable SQL query logging for clean production logs
         pool_pre_ping=True,
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer,
         connect_args={"check_same_thread": False} if "sqlite" in db_url else {}
     )
 
@@ -35,6 +81,7 @@ def init_db():
 
     # Create all tables
     Base.metadata.create_all(bind=_engine)
+    _add_missing_columns(_engine)
 
     # Seed demo data on first run
     try:
@@ -3,7 +3,7 @@ Database Models for DaycareMoments
 Core 4 tables: organizations, users, persons (children), photos
 """
 
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -69,7 +69,8 @@ class Photo(Base):
     __tablename__ = 'photos'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    url = Column(String, nullable=False)  # Storage URL or local path
+    url = Column(String, nullable=False, index=True)  # Storage URL or local path (content-addressed uploads share one)
+    content_hash = Column(String(64), index=True)  # blake2b of the image bytes (storage.content_hash), if known
     person_id = Column(String, ForeignKey('persons.id'))
     ai_description = Column(Text)  # AI-generated activity description
     uploaded_by = Column(String, ForeignKey('users.id'))
@@ -80,3 +81,8 @@ class Photo(Base):
     person = relationship("Person", back_populates="photos")
     uploader = relationship("User", back_populates="uploaded_photos", foreign_keys=[uploaded_by])
     organization = relationship("Organization", back_populates="photos")
+
+    # Dashboard stats and recent-photo listings filter by organization and upload time
+    __table_args__ = (
+        Index('ix_photos_organization_uploaded_at', 'organization_id', 'uploaded_at'),
+    )
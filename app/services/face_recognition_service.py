@@ -3,13 +3,18 @@
 import numpy as np
 from PIL import Image
 import io
+import threading
+import time
 from typing import List, Dict, Optional
+from app.config import Config
 from app.database import get_db
 from app.database.models import Person, Photo
 
 # Try to import face_recognition, fallback to mock if not available
 try:
     import face_recognition
+    import face_recognition_models
+    import dlib
     FACE_RECOGNITION_AVAILABLE = True
 except ImportError:
     FACE_RECOGNITION_AVAILABLE = False
@@ -18,15 +23,115 @@ except ImportError:
     print("  1. Install CMake from cmake.org")
     print("  2. pip install face_recognition")
 
+# Optional libjpeg-turbo decoder (PyTurboJPEG); PIL is used when it is unavailable
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbo_jpeg = TurboJPEG()
+except Exception:
+    _turbo_jpeg = None
+
+JPEG_MAGIC = b'\xff\xd8\xff'
+
 
 class FaceRecognitionService:
     """Face recognition service using face_recognition library"""
 
     def __init__(self):
         self.tolerance = 0.6  # Lower = more strict
-        self.model = "hog"  # Can be 'hog' or 'cnn' (cnn is more accurate but slower)
+        self.model = Config.FACE_MODEL  # Can be 'hog' or 'cnn' (cnn is more accurate but slower)
+        self.detection_max_side = Config.FACE_DETECTION_MAX_SIDE  # Detect on a downscaled copy of larger images
+        self.duplicate_threshold = 0.25  # Encodings closer than this add no information
+        self.max_encodings_per_person = 5  # Representative encodings kept per person
+        self.upsample_times = 1  # Same default as face_recognition.face_locations
+        self.known_encodings_ttl = 300  # Seconds an organization's encoding matrix stays cached
+        self._known_encodings_cache = {}  # organization_id -> (matrix, person_ids, squared_norms, loaded_at)
+        self._known_encodings_lock = threading.Lock()
+        # One set of dlib models per process, shared by every caller (Streamlit sessions,
+        # photo processor workers); dlib models are not documented as thread-safe, so
+        # inference is serialized while decoding and matching run outside the lock
+        self._model_lock = threading.Lock()
         self.mock_mode = not FACE_RECOGNITION_AVAILABLE
 
+        if not self.mock_mode:
+            self._load_models()
+
+    def _load_models(self):
+        """Load the dlib detector, landmark predictor and encoder once per service"""
+        if self.model == "cnn":
+            self._detector = dlib.cnn_face_detection_model_v1(
+                face_recognition_models.cnn_face_detector_model_location()
+            )
+        else:
+            self._detector = dlib.get_frontal_face_detector()
+
+        self._shape_predictor = dlib.shape_predictor(
+            face_recognition_models.pose_predictor_five_point_model_location()
+        )
+        self._encoder = dlib.face_recognition_model_v1(
+            face_recognition_models.face_recognition_model_location()
+        )
+
+    def _decode_image(self, image_data: bytes) -> np.ndarray:
+        """Decode image bytes into an RGB array (libjpeg-turbo for JPEGs when installed)"""
+        if _turbo_jpeg is not None and image_data[:3] == JPEG_MAGIC:
+            try:
+                return _turbo_jpeg.decode(image_data, pixel_format=TJPF_RGB)
+            except Exception as e:
+                print(f"TurboJPEG decode failed, falling back to PIL: {e}")
+        return np.array(Image.open(io.BytesIO(image_data)).convert("RGB"))
+
+    def _detect_faces(self, image: np.ndarray) -> list:
+        """
+        Run the persistent detector on a decoded image and return dlib rectangles
+
+        Images larger than detection_max_side are downscaled for detection only;
+        the rectangles are scaled back so landmarks and encodings use full resolution.
+        """
+        scale = 1.0
+        detection_image = image
+        longest_side = max(image.shape[:2])
+        if self.detection_max_side and longest_side > self.detection_max_side:
+            scale = self.detection_max_side / longest_side
+            detection_image = np.asarray(Image.fromarray(image).resize(
+                (round(image.shape[1] * scale), round(image.shape[0] * scale)),
+                Image.BILINEAR
+            ))
+
+        with self._model_lock:
+            detections = self._detector(detection_image, self.upsample_times)
+        if self.model == "cnn":
+            rects = [detection.rect for detection in detections]
+        else:
+            rects = list(detections)
+
+        if scale == 1.0:
+            return rects
+        return [
+            dlib.rectangle(
+                int(rect.left() / scale), int(rect.top() / scale),
+                int(rect.right() / scale), int(rect.bottom() / scale)
+            )
+            for rect in rects
+        ]
+
+    def _encode_from_array(self, image: np.ndarray, rects: list) -> List[np.ndarray]:
+        """Compute 128-D encodings for already-detected faces in one encoder call"""
+        shapes = dlib.full_object_detections()
+        with self._model_lock:
+            for rect in rects:
+                shapes.append(self._shape_predictor(image, rect))
+            descriptors = self._encoder.compute_face_descriptor(image, shapes, 1)
+        return [np.array(descriptor) for descriptor in descriptors]
+
+    def _rect_to_location(self, rect, image_shape) -> Dict[str, int]:
+        """Convert a dlib rectangle to a top/right/bottom/left dict clipped to the image"""
+        return {
+            "top": max(rect.top(), 0),
+            "right": min(rect.right(), image_shape[1]),
+            "bottom": min(rect.bottom(), image_shape[0]),
+            "left": max(rect.left(), 0)
+        }
+
     def encode_face(self, image_data: bytes) -> Optional[np.ndarray]:
         """
         Extract face encoding from image
@@ -42,22 +147,14 @@ class FaceRecognitionService:
             return np.random.rand(128)
 
         try:
-            # Load image
-            image = face_recognition.load_image_file(io.BytesIO(image_data))
+            image = self._decode_image(image_data)
+            rects = self._detect_faces(image)
 
-            # Find faces
-            face_locations = face_recognition.face_locations(image, model=self.model)
-
-            if not face_locations:
+            if not rects:
                 return None
 
-            # Get encoding for first face
-            encodings = face_recognition.face_encodings(image, face_locations)
-
-            if encodings:
-                return encodings[0]
-
-            return None
+            # Only the first face is needed
+            return self._encode_from_array(image, rects[:1])[0]
 
         except Exception as e:
             print(f"Face encoding error: {e}")
@@ -78,14 +175,13 @@ class FaceRecognitionService:
             return [np.random.rand(128)]
 
         try:
-            image = face_recognition.load_image_file(io.BytesIO(image_data))
-            face_locations = face_recognition.face_locations(image, model=self.model)
+            image = self._decode_image(image_data)
+            rects = self._detect_faces(image)
 
-            if not face_locations:
+            if not rects:
                 return []
 
-            encodings = face_recognition.face_encodings(image, face_locations)
-            return encodings
+            return self._encode_from_array(image, rects)
 
         except Exception as e:
             print(f"Multiple face encoding error: {e}")
@@ -126,44 +222,7 @@ class FaceRecognitionService:
             Person ID if match found, None otherwise
         """
         try:
-            with get_db() as db:
-                # Get all persons with face encodings in this organization
-                persons = db.query(Person).filter(
-                    Person.organization_id == organization_id
-                ).all()
-
-                best_match_id = None
-                best_match_distance = float('inf')
-
-                for person in persons:
-                    # Check if person has face encodings (JSON list)
-                    if not person.face_encodings or len(person.face_encodings) == 0:
-                        continue
-
-                    # Compare with each stored encoding
-                    for stored_encoding_list in person.face_encodings:
-                        try:
-                            known_encoding = np.array(stored_encoding_list, dtype=np.float64)
-
-                            # Compare faces and get distance
-                            matches = face_recognition.compare_faces(
-                                [known_encoding],
-                                face_encoding,
-                                tolerance=self.tolerance
-                            )
-
-                            if matches[0]:
-                                # Calculate face distance for best match
-                                distance = face_recognition.face_distance([known_encoding], face_encoding)[0]
-                                if distance < best_match_distance:
-                                    best_match_distance = distance
-                                    best_match_id = person.id
-
-                        except Exception as e:
-                            print(f"Error comparing encoding: {e}")
-                            continue
-
-                return best_match_id
+            return self._match_encodings([face_encoding], organization_id)[0]
 
         except Exception as e:
             print(f"Person identification error: {e}")
@@ -180,18 +239,231 @@ class FaceRecognitionService:
         Returns:
             List of person IDs found in photo
         """
-        identified_persons = []
+        # dict.fromkeys dedupes in first-seen order
+        return list(dict.fromkeys(
+            face["person_id"]
+            for face in self.analyze_photo(image_data, organization_id)
+            if face["person_id"]
+        ))
+
+    def detect_and_encode(self, image_data: bytes):
+        """
+        Locate and encode every face in an image with one decode and one detector pass
 
-        # Get all face encodings from photo
-        face_encodings = self.encode_faces_multiple(image_data)
+        Args:
+            image_data: Image bytes
 
-        # Try to identify each face
-        for encoding in face_encodings:
-            person_id = self.identify_person(encoding, organization_id)
-            if person_id and person_id not in identified_persons:
-                identified_persons.append(person_id)
+        Returns:
+            Tuple of (face locations as top/right/bottom/left dicts, matching list of encodings)
 
-        return identified_persons
+        Raises:
+            Exception: If the image cannot be decoded (callers handle and log it)
+        """
+        if self.mock_mode:
+            return self.get_face_locations(image_data), self.encode_faces_multiple(image_data)
+
+        image = self._decode_image(image_data)
+        rects = self._detect_faces(image)
+        if not rects:
+            return [], []
+        return [self._rect_to_location(rect, image.shape) for rect in rects], self._encode_from_array(image, rects)
+
+    def analyze_photo(self, image_data: bytes, organization_id: str) -> List[Dict[str, any]]:
+        """
+        Detect, encode and identify every face in a photo in a single pass
+
+        The image is decoded once, the detector and encoder run once, and all
+        faces are matched against the organization's stored encodings with one
+        distance matrix.
+
+        Args:
+            image_data: Image bytes
+            organization_id: Organization ID to search within
+
+        Returns:
+            List of dicts with 'location' (top/right/bottom/left) and 'person_id'
+            (None when the face did not match anyone)
+        """
+        try:
+            locations, encodings = self.detect_and_encode(image_data)
+            if not locations:
+                return []
+
+            person_ids = self._match_encodings(encodings, organization_id)
+
+            return [
+                {"location": location, "person_id": person_id}
+                for location, person_id in zip(locations, person_ids)
+            ]
+
+        except Exception as e:
+            print(f"Photo analysis error: {e}")
+            return []
+
+    def analyze_photos(
+        self,
+        images: List[bytes],
+        organization_id: str,
+        batch_size: int = 32
+    ) -> List[List[Dict[str, any]]]:
+        """
+        Batched analyze_photo for several photos from the same organization
+
+        Faces from up to batch_size photos go through the encoder in one call,
+        and the organization's stored encodings are loaded once for all of them.
+
+        Args:
+            images: List of image bytes
+            organization_id: Organization ID to search within
+            batch_size: Photos encoded per encoder call
+
+        Returns:
+            One analyze_photo result list per image, in the same order
+        """
+        if self.mock_mode:
+            return [self.analyze_photo(image_data, organization_id) for image_data in images]
+
+        results = []
+        try:
+            known = self._load_known_encodings(organization_id)
+        except Exception as e:
+            print(f"Photo analysis error: {e}")
+            return [[] for _ in images]
+
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            try:
+                results.extend(self._analyze_chunk(chunk, known))
+            except Exception as e:
+                print(f"Batch photo analysis error: {e}")
+                results.extend(self.analyze_photo(image_data, organization_id) for image_data in chunk)
+
+        return results
+
+    def _analyze_chunk(self, images: List[bytes], known) -> List[List[Dict[str, any]]]:
+        """Detect faces per image, encode every face with one batched encoder call, then match"""
+        decoded = []
+        locations = []
+        for image_data in images:
+            try:
+                image = self._decode_image(image_data)
+                rects = self._detect_faces(image)
+            except Exception as e:
+                print(f"Photo analysis error: {e}")
+                image, rects = None, []
+            locations.append([self._rect_to_location(rect, image.shape) for rect in rects])
+            if rects:
+                shapes = dlib.full_object_detections()
+                with self._model_lock:
+                    for rect in rects:
+                        shapes.append(self._shape_predictor(image, rect))
+                decoded.append((image, shapes))
+
+        encodings = []
+        if decoded:
+            with self._model_lock:
+                batch_descriptors = self._encoder.compute_face_descriptor(
+                    [image for image, _ in decoded],
+                    [shapes for _, shapes in decoded],
+                    1
+                )
+            for descriptors in batch_descriptors:
+                encodings.extend(np.array(descriptor) for descriptor in descriptors)
+
+        person_ids = self._match_encodings(encodings, known=known)
+
+        results = []
+        offset = 0
+        for image_locations in locations:
+            image_person_ids = person_ids[offset:offset + len(image_locations)]
+            offset += len(image_locations)
+            results.append([
+                {"location": location, "person_id": person_id}
+                for location, person_id in zip(image_locations, image_person_ids)
+            ])
+        return results
+
+    def _load_known_encodings(self, organization_id: str):
+        """
+        Load all stored encodings for an organization as a matrix
+
+        The result is cached per organization for known_encodings_ttl seconds
+        and dropped early by invalidate_known_encodings when encodings change.
+        The matrix is held as float32: half the memory and bandwidth of float64,
+        with distance error far below tolerance.
+
+        Returns:
+            Tuple of (N x 128 float32 encoding matrix, list of N person IDs, N squared row norms),
+            or (None, [], None) if none stored
+        """
+        now = time.monotonic()
+        with self._known_encodings_lock:
+            cached = self._known_encodings_cache.get(organization_id)
+        if cached is not None and now - cached[3] < self.known_encodings_ttl:
+            return cached[:3]
+
+        with get_db() as db:
+            persons = db.query(Person.id, Person.face_encodings).filter(
+                Person.organization_id == organization_id
+            ).all()
+
+        rows = []
+        row_person_ids = []
+        for person_id, face_encodings in persons:
+            for stored_encoding_list in face_encodings or []:
+                rows.append(stored_encoding_list)
+                row_person_ids.append(person_id)
+
+        if rows:
+            matrix = np.ascontiguousarray(rows, dtype=np.float32)
+            known = (matrix, row_person_ids, np.einsum('ij,ij->i', matrix, matrix))
+        else:
+            known = (None, [], None)
+
+        with self._known_encodings_lock:
+            self._known_encodings_cache[organization_id] = known + (now,)
+        return known
+
+    def invalidate_known_encodings(self, organization_id: str = None):
+        """Drop cached encodings for one organization (or all) after they change"""
+        with self._known_encodings_lock:
+            if organization_id is None:
+                self._known_encodings_cache.clear()
+            else:
+                self._known_encodings_cache.pop(organization_id, None)
+
+    def _match_encodings(
+        self,
+        encodings: List[np.ndarray],
+        organization_id: str = None,
+        known=None
+    ) -> List[Optional[str]]:
+        """
+        Match each encoding to its nearest stored encoding within tolerance
+
+        known is a preloaded _load_known_encodings result; without it the
+        organization's encodings are loaded here.
+        """
+        if not encodings:
+            return []
+
+        if known is None:
+            known = self._load_known_encodings(organization_id)
+        known_matrix, row_person_ids, known_sq_norms = known
+        if known_matrix is None:
+            return [None] * len(encodings)
+
+        # (faces x stored) Euclidean distance matrix via |a|^2 + |b|^2 - 2ab, one matrix product
+        unknown_matrix = np.asarray(encodings, dtype=np.float32)
+        unknown_sq_norms = np.einsum('ij,ij->i', unknown_matrix, unknown_matrix)
+        squared = unknown_sq_norms[:, None] + known_sq_norms[None, :] - 2.0 * (unknown_matrix @ known_matrix.T)
+        distances = np.sqrt(np.maximum(squared, 0.0))
+        best_rows = distances.argmin(axis=1)
+
+        return [
+            row_person_ids[row] if distances[face_index, row] <= self.tolerance else None
+            for face_index, row in enumerate(best_rows)
+        ]
 
     def train_person(self, person_id: str, training_images: List[bytes]) -> Dict[str, any]:
         """
@@ -233,13 +505,17 @@ class FaceRecognitionService:
                 person = db.query(Person).filter(Person.id == person_id).first()
 
                 if person:
-                    # Update face encodings (append to existing or create new)
+                    # Merge with existing encodings, dropping near-duplicates
                     existing_encodings = person.face_encodings or []
-                    person.face_encodings = existing_encodings + all_encodings
+                    combined = existing_encodings + all_encodings
+                    kept = self._select_encodings(combined)
+                    person.face_encodings = [list(combined[i]) for i in kept]
                     db.commit()
+                    self.invalidate_known_encodings(person.organization_id)
 
                     result["success"] = True
-                    result["encodings_added"] = len(all_encodings)
+                    # New encodings that survived pruning (they may replace pruned existing ones)
+                    result["encodings_added"] = sum(1 for i in kept if i >= len(existing_encodings))
                     result["total_encodings"] = len(person.face_encodings)
                     return result
                 else:
@@ -251,6 +527,50 @@ class FaceRecognitionService:
             print(f"Face training error: {e}")
             return result
 
+    def prune_encodings(self, encodings: List[List[float]]) -> List[List[float]]:
+        """
+        Reduce encodings to a small set of representative vectors before storing them
+
+        Near-duplicates (closer than duplicate_threshold to an encoding already kept)
+        are dropped, then the set is capped at max_encodings_per_person using
+        greedy farthest-point selection so the kept vectors stay spread out.
+
+        Args:
+            encodings: Face encodings as JSON-serializable lists
+
+        Returns:
+            Pruned list of encodings
+        """
+        return [list(encodings[i]) for i in self._select_encodings(encodings)]
+
+    def _select_encodings(self, encodings: List[List[float]]) -> List[int]:
+        """Indices of the encodings prune_encodings keeps, in input order"""
+        if not encodings:
+            return []
+
+        vectors = np.asarray(encodings, dtype=np.float64)
+
+        kept = [0]
+        for i in range(1, len(vectors)):
+            distances = np.linalg.norm(vectors[kept] - vectors[i], axis=1)
+            if distances.min() >= self.duplicate_threshold:
+                kept.append(i)
+
+        if len(kept) > self.max_encodings_per_person:
+            candidates = vectors[kept]
+            selected = [0]
+            min_distances = np.linalg.norm(candidates - candidates[0], axis=1)
+            while len(selected) < self.max_encodings_per_person:
+                next_index = int(np.argmax(min_distances))
+                selected.append(next_index)
+                min_distances = np.minimum(
+                    min_distances,
+                    np.linalg.norm(candidates - candidates[next_index], axis=1)
+                )
+            kept = [kept[i] for i in sorted(selected)]
+
+        return kept
+
     def get_face_locations(self, image_data: bytes) -> List[Dict[str, int]]:
         """
         Get bounding boxes for all faces in image
@@ -266,13 +586,8 @@ class FaceRecognitionService:
             return [{"top": 100, "right": 300, "bottom": 300, "left": 100}]
 
         try:
-            image = face_recognition.load_image_file(io.BytesIO(image_data))
-            locations = face_recognition.face_locations(image, model=self.model)
-
-            return [
-                {"top": top, "right": right, "bottom": bottom, "left": left}
-                for top, right, bottom, left in locations
-            ]
+            image = self._decode_image(image_data)
+            return [self._rect_to_location(rect, image.shape) for rect in self._detect_faces(image)]
 
         except Exception as e:
             print(f"Face location error: {e}")
@@ -281,11 +596,14 @@ class FaceRecognitionService:
 
 # Singleton instance
 _face_recognition_service = None
+_face_recognition_service_lock = threading.Lock()
 
 
 def get_face_recognition_service() -> FaceRecognitionService:
-    """Get face recognition service singleton"""
+    """Get face recognition service singleton (thread-safe, so the models load once per process)"""
     global _face_recognition_service
     if _face_recognition_service is None:
-        _face_recognition_service = FaceRecognitionService()
+        with _face_recognition_service_lock:
+            if _face_recognition_service is None:
+                _face_recognition_service = FaceRecognitionService()
     return _face_recognition_service
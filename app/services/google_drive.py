@@ -5,7 +5,21 @@ Reusable service for uploading, downloading, and managing files in Google Drive
 
 import os
 import io
-from typing import List, Dict, Optional, BinaryIO
+import asyncio
+import threading
+import time
+import itertools
+import functools
+import json
+import mimetypes
+import random
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Optional, BinaryIO, Union, Iterator
 from datetime import datetime
 from pathlib import Path
 
@@ -14,13 +28,105 @@ try:
     from google.oauth2 import service_account
     from google_auth_oauthlib.flow import InstalledAppFlow
     from google.auth.transport.requests import Request
-    from googleapiclient.discovery import build
-    from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload, MediaIoBaseDownload
+    from googleapiclient.discovery import build, build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
+    from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload, MediaIoBaseDownload, HttpRequest, build_http
     from googleapiclient.errors import HttpError
+    from google_auth_httplib2 import AuthorizedHttp
     GOOGLE_DRIVE_AVAILABLE = True
 except ImportError:
     GOOGLE_DRIVE_AVAILABLE = False
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+mimetypes.init()
+_mime_types_map = mimetypes.types_map
+_mime_common_types = mimetypes.common_types
+
+# Caps concurrent Drive requests per process (Drive allows ~10 writes/sec per user)
+MAX_CONCURRENT_REQUESTS = 10
+_drive_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Drive query for a folder with an exact name
+_FOLDER_QUERY = f"mimeType='{FOLDER_MIME_TYPE}' and name='{{}}'"
+_YEAR_MONTH_PATTERN = re.compile(r'^\d{4}-\d{2}$')
+
+
+@functools.lru_cache(maxsize=256)
+def _files_query(folder_id: Optional[str], query: Optional[str]) -> str:
+    """Build (and memoise) the files().list q string for a folder and extra filter"""
+    if folder_id:
+        q = f"'{folder_id}' in parents"
+        return f"{q} and {query}" if query else q
+    return query or ""
+
+
+def _file_body(
+    name: str,
+    parent_id: Optional[str] = None,
+    description: Optional[str] = None,
+    mime_type: Optional[str] = None
+) -> Dict:
+    """Build a files().create request body in one literal, omitting unset keys"""
+    if parent_id is None and description is None and mime_type is None:
+        return {'name': name}
+
+    body = {
+        'name': name,
+        'parents': [parent_id] if parent_id else None,
+        'description': description or None,
+        'mimeType': mime_type,
+    }
+    return {key: value for key, value in body.items() if value is not None}
+
+
+def _folder_query(name: str) -> str:
+    """Build a folder-by-name query with the name escaped for Drive's query syntax"""
+    return _FOLDER_QUERY.format(name.replace('\\', '\\\\').replace("'", "\\'"))
+
+
+# Parsed OAuth credentials shared by all service instances, keyed by token path
+_creds_cache: Dict[str, "Credentials"] = {}
+# Service account credentials keyed by (path, mtime)
+_service_account_creds_cache: Dict[tuple, "service_account.Credentials"] = {}
+_creds_lock = threading.Lock()
+
+# Refresh OAuth tokens this long before they actually expire
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+
+def _needs_refresh(creds) -> bool:
+    """True if creds are invalid or will expire within TOKEN_REFRESH_MARGIN_SECONDS"""
+    if not creds or not creds.valid:
+        return True
+    if creds.expiry is None:
+        return False
+    # google-auth stores expiry as naive UTC
+    return (creds.expiry - datetime.utcnow()).total_seconds() < TOKEN_REFRESH_MARGIN_SECONDS
+
+
+@functools.lru_cache(maxsize=1)
+def _drive_discovery_doc() -> Optional[Dict]:
+    """Parse the Drive v3 discovery document bundled with googleapiclient once per process"""
+    doc = get_static_doc('drive', 'v3')
+    return json.loads(doc) if doc else None
+
+
+@functools.lru_cache(maxsize=512)
+def _mime_for_ext(ext: str) -> str:
+    """Look up the MIME type for a file extension (e.g. '.jpg')"""
+    ext = ext.lower()
+    return (
+        _mime_types_map.get(ext)
+        or _mime_common_types.get(ext)
+        or 'application/octet-stream'
+    )
+
 
 class GoogleDriveService:
     """
@@ -34,6 +140,7 @@ class GoogleDriveService:
     - List files with filters
     - Create folders
     - Share files/folders with specific users
+    - Concurrent bulk upload/download
     """
 
     # Google Drive API scopes
@@ -42,12 +149,44 @@ class GoogleDriveService:
         'https://www.googleapis.com/auth/drive',       # Full drive access
     ]
 
+    # Maximum number of calls per Drive batch request
+    BATCH_SIZE = 100
+
+    # Transient Drive errors worth retrying, and how many times
+    RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRIES = 5
+
+    # Requests safe to resend after a dropped connection or timeout, when the
+    # server may already have applied them
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD'})
+
+    # Lets every call work on Shared Drives as well as My Drive
+    ALL_DRIVES = {'supportsAllDrives': True}
+
+    # Default file fields returned by upload_file / get_file_metadata
+    UPLOAD_FIELDS = 'id, name, mimeType, size, createdTime, webViewLink, webContentLink'
+    METADATA_FIELDS = 'id, name, mimeType, size, createdTime, modifiedTime, webViewLink, webContentLink, parents'
+
+    # Default file fields returned by list_files / iter_files
+    LIST_FIELDS = 'files(id, name, mimeType, size, createdTime, modifiedTime, webViewLink, webContentLink)'
+
+    # Uploads at or above this size use a resumable session
+    RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+
+    # Default resumable upload chunk size (Drive requires multiples of 256 KB)
+    UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+    # Media download chunk size (googleapiclient defaults to 100 KB)
+    DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
     def __init__(
         self,
         credentials_path: Optional[str] = None,
         token_path: Optional[str] = None,
         service_account_path: Optional[str] = None,
-        mode: Optional[str] = None
+        mode: Optional[str] = None,
+        max_workers: int = 8,
+        chunk_size: int = None
     ):
         """
         Initialize Google Drive service
@@ -56,6 +195,9 @@ class GoogleDriveService:
             credentials_path: Path to OAuth2 credentials.json
             service_account_path: Path to service account JSON file
             token_path: Path to store OAuth2 token (for user authentication)
+            max_workers: Thread pool size for bulk operations (Drive allows ~10 writes/sec per user)
+            chunk_size: Resumable upload chunk size in bytes, a multiple of 256 KB
+                (defaults to UPLOAD_CHUNK_SIZE)
         """
         if not GOOGLE_DRIVE_AVAILABLE:
             raise ImportError(
@@ -67,8 +209,35 @@ class GoogleDriveService:
         self.token_path = token_path or os.getenv('GOOGLE_DRIVE_TOKEN', 'token.json')
         self.service_account_path = service_account_path or os.getenv('GOOGLE_DRIVE_SERVICE_ACCOUNT')
         self.mode = mode or os.getenv('GOOGLE_DRIVE_MODE', 'oauth')  # 'oauth' or 'service_account'
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size or self.UPLOAD_CHUNK_SIZE
         self.service = None
         self.creds = None
+        self._thread_local = threading.local()
+
+        # (parent_folder_id, folder_name) -> (folder_id, expires_at)
+        self.folder_cache_ttl = 3600
+        self._folder_cache: Dict[tuple, tuple] = {}
+        self._folder_cache_lock = threading.Lock()
+
+        # Long-lived pool for bulk transfers so each worker's keep-alive
+        # connection survives across calls (created on first use)
+        self._io_executor = None
+
+        # Background pool for photo preprocessing + upload (created on first use)
+        self._background_executor = None
+        self._background_executor_lock = threading.Lock()
+
+        # list_files arguments -> (files, expires_at), least recently used first;
+        # repeated listings such as UI polling are served from here for
+        # list_cache_ttl seconds
+        self.list_cache_ttl = 30
+        self.list_cache_size = 64
+        self._list_cache: OrderedDict = OrderedDict()
+
+        # daycare_id -> (base_folder_id, expires_at)
+        self.daycare_folder_cache_ttl = 300
+        self._daycare_folder_cache: Dict[int, tuple] = {}
 
     def authenticate_user(self) -> bool:
         """
@@ -78,36 +247,78 @@ class GoogleDriveService:
         Returns:
             True if authentication successful
         """
-        creds = None
-
-        # Load existing token if available
-        if os.path.exists(self.token_path):
-            creds = Credentials.from_authorized_user_file(self.token_path, self.SCOPES)
-
-        # Refresh or get new credentials
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists(self.credentials_path):
-                    raise FileNotFoundError(
-                        f"Credentials file not found: {self.credentials_path}\n"
-                        "Get credentials from: https://console.cloud.google.com/"
-                    )
+        needs_consent = False
+        with _creds_lock:
+            creds = _creds_cache.get(self.token_path)
+
+            if _needs_refresh(creds):
+                with self._token_file_lock():
+                    # Load existing token if available (another process may have just refreshed it)
+                    if os.path.exists(self.token_path):
+                        creds = Credentials.from_authorized_user_file(self.token_path, self.SCOPES)
+
+                    # Refresh ahead of expiry so the next API call doesn't hit a 401
+                    if _needs_refresh(creds):
+                        if creds and creds.refresh_token:
+                            creds.refresh(Request())
+                            # Save token for future use
+                            self._write_token(creds)
+                        else:
+                            needs_consent = True
+
+                if not needs_consent:
+                    _creds_cache[self.token_path] = creds
+
+        if needs_consent:
+            if self.mode == 'service_account':
+                raise RuntimeError(
+                    "Interactive OAuth flow is disabled in service_account mode"
+                )
 
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_path, self.SCOPES
+            if not os.path.exists(self.credentials_path):
+                raise FileNotFoundError(
+                    f"Credentials file not found: {self.credentials_path}\n"
+                    "Get credentials from: https://console.cloud.google.com/"
                 )
-                creds = flow.run_local_server(port=0)
 
-            # Save token for future use
-            with open(self.token_path, 'w') as token:
-                token.write(creds.to_json())
+            # The user can sit on the consent screen for minutes, so the flow runs
+            # outside the locks; other threads keep refreshing and authenticating,
+            # and only the result is published under them
+            flow = InstalledAppFlow.from_client_secrets_file(
+                self.credentials_path, self.SCOPES
+            )
+            creds = flow.run_local_server(port=0)
+
+            with _creds_lock:
+                with self._token_file_lock():
+                    self._write_token(creds)
+                _creds_cache[self.token_path] = creds
 
         self.creds = creds
-        self.service = build('drive', 'v3', credentials=creds)
+        self.service = self._build_service(creds)
         return True
 
+    @contextmanager
+    def _token_file_lock(self):
+        """Serialize token refresh across processes sharing token_path (no-op without fcntl)"""
+        if fcntl is None:
+            yield
+            return
+
+        with open(f"{self.token_path}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_token(self, creds):
+        """Atomically replace the token file so readers never see a partial write"""
+        tmp_path = f"{self.token_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, self.token_path)
+
     def authenticate_service_account(self) -> bool:
         """
         Authenticate using service account (app-wide access, production mode)
@@ -119,22 +330,90 @@ class GoogleDriveService:
         if not self.service_account_path:
             raise ValueError("Service account path not configured. Set GOOGLE_DRIVE_SERVICE_ACCOUNT in .env")
 
-        if not os.path.exists(self.service_account_path):
+        # One stat serves as both the existence check and the cache key, so an
+        # edited key file is re-read without restarting the process
+        try:
+            cache_key = (self.service_account_path, os.stat(self.service_account_path).st_mtime)
+        except FileNotFoundError:
             raise FileNotFoundError(
                 f"Service account credentials not found: {self.service_account_path}"
             )
 
         try:
-            creds = service_account.Credentials.from_service_account_file(
-                self.service_account_path, scopes=self.SCOPES
-            )
+            with _creds_lock:
+                creds = _service_account_creds_cache.get(cache_key)
+                if creds is None:
+                    creds = service_account.Credentials.from_service_account_file(
+                        self.service_account_path, scopes=self.SCOPES
+                    )
+                    _service_account_creds_cache[cache_key] = creds
 
             self.creds = creds
-            self.service = build('drive', 'v3', credentials=creds)
+            self.service = self._build_service(creds)
             return True
         except Exception as e:
             raise RuntimeError(f"Service account authentication failed: {e}")
 
+    def warmup(self) -> bool:
+        """
+        Authenticate and pre-fetch an access token ahead of the first request
+
+        Call once at process startup so the first Drive call after a restart
+        does not stall on credential loading and token exchange.
+
+        Returns:
+            True if warmup successful
+        """
+        if not self.service:
+            self.authenticate()
+
+        if _needs_refresh(self.creds):
+            with _creds_lock:
+                if _needs_refresh(self.creds):
+                    self.creds.refresh(Request())
+        return True
+
+    def _get_thread_http(self, creds) -> "AuthorizedHttp":
+        """
+        Return this thread's authorized connection, creating it on first use
+
+        build_http() sets the socket timeout and stops treating Drive's
+        "308 Resume Incomplete" (resumable upload chunks) as a redirect,
+        same as the connection build() would create.
+        """
+        local = self._thread_local
+        if getattr(local, 'creds', None) is not creds:
+            local.http = AuthorizedHttp(creds, http=build_http())
+            local.creds = creds
+        return local.http
+
+    def _build_service(self, creds):
+        """
+        Build the Drive API client
+
+        httplib2.Http is not thread-safe, so requests never share a socket
+        across threads: each request is bound to its calling thread's own
+        AuthorizedHttp, which still keeps the connection alive between calls
+        made from the same thread.
+        """
+        def build_request(http, *args, **kwargs):
+            return HttpRequest(self._get_thread_http(creds), *args, **kwargs)
+
+        http = self._get_thread_http(creds)
+
+        # Build from the bundled discovery document so no instance pays a
+        # network fetch (or file-cache lookup) for it
+        discovery_doc = _drive_discovery_doc()
+        if discovery_doc is not None:
+            return build_from_document(discovery_doc, http=http, requestBuilder=build_request)
+
+        return build(
+            'drive', 'v3',
+            http=http,
+            requestBuilder=build_request,
+            cache_discovery=False
+        )
+
     def authenticate(self) -> bool:
         """
         Smart authentication - chooses method based on mode configuration
@@ -158,18 +437,28 @@ class GoogleDriveService:
         file_name: str = None,
         mime_type: str = None,
         folder_id: str = None,
-        description: str = None
+        description: str = None,
+        chunk_size: int = None,
+        fields: str = None
     ) -> Dict:
         """
         Upload a file to Google Drive
 
+        Files under RESUMABLE_THRESHOLD are sent as a single multipart request;
+        larger files use a resumable session with large chunks.
+
         Args:
             file_path: Path to local file (if uploading from disk)
-            file_content: File-like object (if uploading from memory)
+            file_content: File-like object (if uploading from memory). Prefer an
+                open file or SpooledTemporaryFile over a BytesIO of the whole
+                payload; only one chunk is held in memory at a time.
             file_name: Name for the file in Drive
             mime_type: MIME type of file (auto-detected if not provided)
             folder_id: Google Drive folder ID (uploads to root if not provided)
             description: File description
+            chunk_size: Resumable chunk size in bytes, a multiple of 256 KB
+                (defaults to the service's chunk_size)
+            fields: Partial-response fields, e.g. 'id' (defaults to UPLOAD_FIELDS)
 
         Returns:
             Dict with file metadata (id, name, webViewLink, etc.)
@@ -189,36 +478,68 @@ class GoogleDriveService:
         if not mime_type:
             mime_type = 'application/octet-stream'
 
-        # Prepare file metadata
-        file_metadata = {
-            'name': file_name,
-        }
-
-        if folder_id:
-            file_metadata['parents'] = [folder_id]
-
-        if description:
-            file_metadata['description'] = description
+        file_metadata = _file_body(file_name, parent_id=folder_id, description=description)
 
         # Upload file
         try:
+            if file_content is not None:
+                file_content = self._ensure_seekable(file_content)
+
+            size = self._get_upload_size(file_path, file_content)
+            resumable = size is None or size >= self.RESUMABLE_THRESHOLD
+            chunk_size = chunk_size or self.chunk_size
+
             if file_path:
-                media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
+                media = MediaFileUpload(file_path, mimetype=mime_type, resumable=resumable, chunksize=chunk_size)
             else:
-                media = MediaIoBaseUpload(file_content, mimetype=mime_type, resumable=True)
+                media = MediaIoBaseUpload(file_content, mimetype=mime_type, resumable=resumable, chunksize=chunk_size)
 
-            file = self.service.files().create(
+            file = self._execute_with_retry(self.service.files().create(
                 body=file_metadata,
                 media_body=media,
-                fields='id, name, mimeType, size, createdTime, webViewLink, webContentLink'
-            ).execute()
+                fields=fields or self.UPLOAD_FIELDS,
+                **self.ALL_DRIVES
+            ))
 
+            self._invalidate_list_cache(folder_id)
             return file
 
         except HttpError as error:
             raise RuntimeError(f"Failed to upload file: {error}")
 
-    def download_file(self, file_id: str, destination_path: str = None) -> bytes:
+    def _ensure_seekable(self, file_content: BinaryIO) -> BinaryIO:
+        """
+        Return a seekable stream for MediaIoBaseUpload
+
+        Non-seekable streams (pipes, request bodies) are spooled into a
+        SpooledTemporaryFile that keeps at most one upload chunk in memory and
+        spills the rest to disk.
+        """
+        try:
+            if file_content.seekable():
+                return file_content
+        except AttributeError:
+            pass
+
+        spooled = tempfile.SpooledTemporaryFile(max_size=self.chunk_size)
+        shutil.copyfileobj(file_content, spooled, self.chunk_size)
+        spooled.seek(0)
+        return spooled
+
+    def _get_upload_size(self, file_path: str = None, file_content: BinaryIO = None) -> Optional[int]:
+        """Return the number of bytes to upload, or None if it cannot be determined"""
+        if file_path:
+            return os.path.getsize(file_path)
+
+        try:
+            position = file_content.tell()
+            size = file_content.seek(0, io.SEEK_END) - position
+            file_content.seek(position)
+            return size
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def download_file(self, file_id: str, destination_path: str = None) -> Union[bytes, str]:
         """
         Download a file from Google Drive
 
@@ -227,47 +548,247 @@ class GoogleDriveService:
             destination_path: Local path to save file (optional)
 
         Returns:
-            File content as bytes
+            destination_path if given (the file is streamed to disk and not
+            read back), otherwise the file content as bytes
+        """
+        if destination_path:
+            return self.download_to_path(file_id, destination_path)
+        return self.download_to_memory(file_id)
+
+    def download_to_path(self, file_id: str, destination_path: str) -> str:
+        """
+        Stream a file from Google Drive straight to disk
+
+        Args:
+            file_id: Google Drive file ID
+            destination_path: Local path to save file
+
+        Returns:
+            destination_path
+        """
+        with io.FileIO(destination_path, 'wb') as fh:
+            self.download_to_stream(file_id, fh)
+
+        return destination_path
+
+    def download_to_stream(self, file_id: str, writer: BinaryIO, max_size: int = None) -> int:
+        """
+        Stream a file from Google Drive into a caller-supplied writable file object
+
+        Only one chunk is held in memory at a time.
+
+        Args:
+            file_id: Google Drive file ID
+            writer: Writable binary file-like object
+            max_size: Abort with ValueError if the file is larger than this many bytes
+
+        Returns:
+            Number of bytes written
         """
         if not self.service:
             raise RuntimeError("Not authenticated")
 
         try:
-            request = self.service.files().get_media(fileId=file_id)
+            request = self.service.files().get_media(fileId=file_id, **self.ALL_DRIVES)
+            return self._run_download(writer, request, max_size)
 
-            if destination_path:
-                # Download to file
-                fh = io.FileIO(destination_path, 'wb')
-                downloader = MediaIoBaseDownload(fh, request)
+        except HttpError as error:
+            raise RuntimeError(f"Failed to download file: {error}")
 
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
+    def download_to_path_parallel(self, file_id: str, destination_path: str, parts: int = 4) -> str:
+        """
+        Download a large file to disk using concurrent ranged requests
 
-                fh.close()
+        The file is split into DOWNLOAD_CHUNK_SIZE byte ranges which are
+        fetched by `parts` workers and written straight into their slot of a
+        pre-sized destination file. Small files fall back to download_to_path.
 
-                with open(destination_path, 'rb') as f:
-                    return f.read()
-            else:
-                # Download to memory
-                fh = io.BytesIO()
-                downloader = MediaIoBaseDownload(fh, request)
+        Args:
+            file_id: Google Drive file ID
+            destination_path: Local path to save file
+            parts: Number of ranges fetched at once
+
+        Returns:
+            destination_path
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated")
 
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
+        size = int(self.get_file_metadata(file_id, fields='size').get('size') or 0)
+        if size < 2 * self.DOWNLOAD_CHUNK_SIZE:
+            return self.download_to_path(file_id, destination_path)
 
-                return fh.getvalue()
+        with open(destination_path, 'wb') as fh:
+            fh.truncate(size)
 
+        def download_range(start: int):
+            end = min(start + self.DOWNLOAD_CHUNK_SIZE, size) - 1
+            request = self.service.files().get_media(fileId=file_id, **self.ALL_DRIVES)
+            request.headers['Range'] = f"bytes={start}-{end}"
+            data = self._execute_with_retry(request)
+
+            with open(destination_path, 'r+b') as fh:
+                fh.seek(start)
+                fh.write(data)
+
+        try:
+            with ThreadPoolExecutor(max_workers=parts) as executor:
+                list(executor.map(download_range, range(0, size, self.DOWNLOAD_CHUNK_SIZE)))
         except HttpError as error:
             raise RuntimeError(f"Failed to download file: {error}")
 
+        return destination_path
+
+    def download_to_memory(self, file_id: str, max_size: int = None) -> bytes:
+        """
+        Download a file from Google Drive into memory
+
+        Prefer download_to_path / download_to_stream for large files.
+
+        Args:
+            file_id: Google Drive file ID
+            max_size: Abort with ValueError if the file is larger than this many bytes
+
+        Returns:
+            File content as bytes
+        """
+        fh = io.BytesIO()
+        self.download_to_stream(file_id, fh, max_size)
+        return fh.getvalue()
+
+    def _run_download(self, fh, request, max_size: int = None) -> int:
+        """Drive a media download into fh using large chunks; returns bytes written"""
+        downloader = MediaIoBaseDownload(fh, request, chunksize=self.DOWNLOAD_CHUNK_SIZE)
+
+        done = False
+        status = None
+        while not done:
+            status, done = downloader.next_chunk(num_retries=self.MAX_RETRIES)
+            if max_size is not None and status.total_size and status.total_size > max_size:
+                raise ValueError(f"File is {status.total_size} bytes, larger than the {max_size} byte limit")
+
+        return status.resumable_progress if status else 0
+
+    def _map_concurrently(self, fn, items, max_workers: int = None) -> list:
+        """
+        Run fn over items on the shared transfer pool, preserving order
+
+        Pool threads live as long as the service, so each keeps its own
+        authorized HTTP connection open between bulk calls instead of
+        paying a fresh TLS handshake every time. A non-default max_workers
+        gets a one-off pool.
+        """
+        if max_workers and max_workers != self.max_workers:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(fn, items))
+
+        with self._background_executor_lock:
+            if self._io_executor is None:
+                self._io_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='gdrive-io'
+                )
+
+        return list(self._io_executor.map(fn, items))
+
+    def upload_many(self, items: List[Dict], max_workers: int = None) -> List[Dict]:
+        """
+        Upload several files concurrently
+
+        Args:
+            items: List of upload_file keyword-argument dicts
+            max_workers: Thread pool size (defaults to self.max_workers)
+
+        Returns:
+            List of file metadata dicts in the same order as items.
+            Failed uploads are returned as {'error': message}.
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated")
+
+        def upload(item: Dict) -> Dict:
+            try:
+                return self.upload_file(**item)
+            except Exception as e:
+                print(f"Bulk upload error for {item.get('file_name') or item.get('file_path')}: {e}")
+                return {'error': str(e)}
+
+        return self._map_concurrently(upload, items, max_workers)
+
+    def download_many(self, file_ids: List[str], max_workers: int = None) -> Dict[str, Optional[bytes]]:
+        """
+        Download several files concurrently into memory
+
+        Args:
+            file_ids: Google Drive file IDs
+            max_workers: Thread pool size (defaults to self.max_workers)
+
+        Returns:
+            Dict mapping file ID to file bytes (None if the download failed)
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated")
+
+        def download(file_id: str) -> Optional[bytes]:
+            try:
+                return self.download_to_memory(file_id)
+            except Exception as e:
+                print(f"Bulk download error for {file_id}: {e}")
+                return None
+
+        return dict(zip(file_ids, self._map_concurrently(download, file_ids, max_workers)))
+
+    def upload_files(self, file_paths: List[str], folder_id: str = None, max_workers: int = None) -> List[Dict]:
+        """
+        Upload local files into one folder concurrently
+
+        Args:
+            file_paths: Paths of local files to upload
+            folder_id: Google Drive folder ID (uploads to root if not provided)
+            max_workers: Thread pool size (defaults to self.max_workers)
+
+        Returns:
+            List of file metadata dicts in the same order as file_paths.
+            Failed uploads are returned as {'error': message}.
+        """
+        return self.upload_many(
+            [{'file_path': file_path, 'folder_id': folder_id} for file_path in file_paths],
+            max_workers=max_workers
+        )
+
+    def download_files(self, downloads: List[tuple], max_workers: int = None) -> List[Optional[str]]:
+        """
+        Download files straight to disk concurrently
+
+        Args:
+            downloads: List of (file_id, destination_path) tuples
+            max_workers: Thread pool size (defaults to self.max_workers)
+
+        Returns:
+            destination_path per item in the same order as downloads
+            (None if that download failed)
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated")
+
+        def download(item: tuple) -> Optional[str]:
+            file_id, destination_path = item
+            try:
+                return self.download_to_path(file_id, destination_path)
+            except Exception as e:
+                print(f"Bulk download error for {file_id}: {e}")
+                return None
+
+        return self._map_concurrently(download, downloads, max_workers)
+
     def list_files(
         self,
         folder_id: str = None,
         query: str = None,
         page_size: int = 100,
-        order_by: str = 'modifiedTime desc'
+        order_by: str = 'modifiedTime desc',
+        fields: str = None,
+        spaces: str = None
     ) -> List[Dict]:
         """
         List files in Google Drive
@@ -277,34 +798,141 @@ class GoogleDriveService:
             query: Custom query string (e.g., "mimeType='image/jpeg'")
             page_size: Number of files to return
             order_by: Sort order
+            fields: Partial-response file fields, e.g. 'files(id)' (defaults to LIST_FIELDS)
+            spaces: Restrict the search to a space, e.g. 'drive'
 
         Returns:
             List of file metadata dictionaries
+
+        Results are cached for list_cache_ttl seconds (the list_cache_size most
+        recent listings); uploads, folder creation and deletes through this
+        service invalidate the cache. Callers get their own copies.
+        """
+        cache_key = (folder_id, query, page_size, order_by, fields, spaces)
+        now = time.monotonic()
+
+        with self._folder_cache_lock:
+            cached = self._list_cache.get(cache_key)
+            if cached is not None:
+                if cached[1] > now:
+                    self._list_cache.move_to_end(cache_key)
+                    return [dict(file) for file in cached[0]]
+                del self._list_cache[cache_key]
+
+        files = list(itertools.islice(
+            self.iter_files(
+                folder_id=folder_id,
+                query=query,
+                page_size=page_size,
+                order_by=order_by,
+                fields=fields,
+                spaces=spaces
+            ),
+            page_size
+        ))
+
+        if self.list_cache_ttl > 0:
+            with self._folder_cache_lock:
+                self._list_cache[cache_key] = ([dict(file) for file in files], now + self.list_cache_ttl)
+                self._list_cache.move_to_end(cache_key)
+                while len(self._list_cache) > self.list_cache_size:
+                    self._list_cache.popitem(last=False)
+
+        return files
+
+    def _invalidate_list_cache(self, folder_id: str = None):
+        """Drop cached listings of folder_id (plus unscoped listings), or all when folder_id is None"""
+        with self._folder_cache_lock:
+            if folder_id is None:
+                self._list_cache.clear()
+                return
+
+            for key in [key for key in self._list_cache if key[0] in (folder_id, None)]:
+                del self._list_cache[key]
+
+    def iter_files(
+        self,
+        folder_id: str = None,
+        query: str = None,
+        page_size: int = 1000,
+        order_by: str = 'modifiedTime desc',
+        fields: str = None,
+        spaces: str = None
+    ) -> Iterator[Dict]:
+        """
+        Iterate over all matching files, following nextPageToken
+
+        Args:
+            folder_id: List files in specific folder
+            query: Custom query string (e.g., "mimeType='image/jpeg'")
+            page_size: Number of files fetched per request (Drive allows up to 1000)
+            order_by: Sort order (None skips server-side sorting)
+            fields: Partial-response file fields (defaults to LIST_FIELDS)
+            spaces: Restrict the search to a space, e.g. 'drive'
+
+        Yields:
+            File metadata dictionaries
         """
         if not self.service:
             raise RuntimeError("Not authenticated")
 
-        # Build query
-        if folder_id:
-            q = f"'{folder_id}' in parents"
-            if query:
-                q += f" and {query}"
-        else:
-            q = query or ""
+        list_params = {
+            'q': _files_query(folder_id, query),
+            'pageSize': page_size,
+            'fields': f"nextPageToken, {fields or self.LIST_FIELDS}",
+            'includeItemsFromAllDrives': True,
+            **self.ALL_DRIVES
+        }
+        if order_by:
+            list_params['orderBy'] = order_by
+        if spaces:
+            list_params['spaces'] = spaces
+
+        files_resource = self.service.files()
 
         try:
-            results = self.service.files().list(
-                q=q,
-                pageSize=page_size,
-                orderBy=order_by,
-                fields='files(id, name, mimeType, size, createdTime, modifiedTime, webViewLink, webContentLink)'
-            ).execute()
+            request = files_resource.list(**list_params)
 
-            return results.get('files', [])
+            while request is not None:
+                results = self._execute_with_retry(request)
+                yield from results.get('files', [])
+                request = files_resource.list_next(request, results)
 
         except HttpError as error:
             raise RuntimeError(f"Failed to list files: {error}")
 
+    def iter_file_ids(
+        self,
+        folder_id: str = None,
+        query: str = None,
+        page_size: int = 1000,
+        order_by: str = None
+    ) -> Iterator[str]:
+        """
+        Iterate over the IDs of all matching files
+
+        Only IDs are requested from Drive, so each page response stays small
+        and callers that just need IDs (e.g. for batch share/delete) don't
+        pay for full metadata.
+
+        Args:
+            folder_id: List files in specific folder
+            query: Custom query string (e.g., "mimeType='image/jpeg'")
+            page_size: Number of IDs fetched per request
+            order_by: Sort order (None skips server-side sorting)
+
+        Yields:
+            File IDs
+        """
+        for file in self.iter_files(
+            folder_id=folder_id,
+            query=query,
+            page_size=page_size,
+            order_by=order_by,
+            fields='files(id)'
+        ):
+            yield file['id']
+
     def create_folder(self, folder_name: str, parent_folder_id: str = None) -> Dict:
         """
         Create a folder in Google Drive
@@ -319,20 +947,19 @@ class GoogleDriveService:
         if not self.service:
             raise RuntimeError("Not authenticated")
 
-        file_metadata = {
-            'name': folder_name,
-            'mimeType': 'application/vnd.google-apps.folder'
-        }
-
-        if parent_folder_id:
-            file_metadata['parents'] = [parent_folder_id]
+        file_metadata = _file_body(folder_name, parent_id=parent_folder_id, mime_type=FOLDER_MIME_TYPE)
 
         try:
-            folder = self.service.files().create(
+            folder = self._execute_with_retry(self.service.files().create(
                 body=file_metadata,
-                fields='id, name, webViewLink'
-            ).execute()
+                fields='id, name, webViewLink',
+                **self.ALL_DRIVES
+            ))
 
+            if parent_folder_id:
+                self._cache_folder_id(parent_folder_id, folder_name, folder['id'])
+
+            self._invalidate_list_cache(parent_folder_id)
             return folder
 
         except HttpError as error:
@@ -360,23 +987,25 @@ class GoogleDriveService:
         }
 
         try:
-            result = self.service.permissions().create(
+            result = self._execute_with_retry(self.service.permissions().create(
                 fileId=file_id,
                 body=permission,
-                fields='id'
-            ).execute()
+                fields='id',
+                **self.ALL_DRIVES
+            ))
 
             return result
 
         except HttpError as error:
             raise RuntimeError(f"Failed to share file: {error}")
 
-    def get_file_metadata(self, file_id: str) -> Dict:
+    def get_file_metadata(self, file_id: str, fields: str = None) -> Dict:
         """
         Get metadata for a specific file
 
         Args:
             file_id: Google Drive file ID
+            fields: Partial-response fields, e.g. 'id, name' (defaults to METADATA_FIELDS)
 
         Returns:
             File metadata
@@ -385,10 +1014,11 @@ class GoogleDriveService:
             raise RuntimeError("Not authenticated")
 
         try:
-            file = self.service.files().get(
+            file = self._execute_with_retry(self.service.files().get(
                 fileId=file_id,
-                fields='id, name, mimeType, size, createdTime, modifiedTime, webViewLink, webContentLink, parents'
-            ).execute()
+                fields=fields or self.METADATA_FIELDS,
+                **self.ALL_DRIVES
+            ))
 
             return file
 
@@ -409,17 +1039,189 @@ class GoogleDriveService:
             raise RuntimeError("Not authenticated")
 
         try:
-            self.service.files().delete(fileId=file_id).execute()
+            self._execute_with_retry(self.service.files().delete(fileId=file_id, **self.ALL_DRIVES))
+            self._invalidate_list_cache()
             return True
 
         except HttpError as error:
             raise RuntimeError(f"Failed to delete file: {error}")
 
+    def _execute_with_retry(self, request, max_retries: int = None):
+        """
+        Execute a Drive API request, retrying transient failures
+
+        429/5xx responses are retried with exponential backoff and jitter,
+        honoring the Retry-After header when Google sends one. Dropped
+        connections and timeouts are retried only for reads and resumable
+        uploads: a create or batch may have been applied before the
+        connection failed, and resending it would duplicate it. At most
+        MAX_CONCURRENT_REQUESTS requests are in flight per process, matching
+        Drive's per-user write quota.
+
+        Args:
+            request: Unexecuted googleapiclient HttpRequest (or batch)
+            max_retries: Retry limit (defaults to MAX_RETRIES)
+
+        Returns:
+            The request's response
+        """
+        max_retries = self.MAX_RETRIES if max_retries is None else max_retries
+        attempt = 0
+
+        while True:
+            try:
+                with _drive_request_slots:
+                    return request.execute()
+            except HttpError as error:
+                if error.resp.status not in self.RETRYABLE_STATUSES or attempt >= max_retries:
+                    raise
+                time.sleep(self._retry_delay(error, attempt))
+                attempt += 1
+            except (ConnectionError, TimeoutError):
+                # Dropped/reset connections and socket timeouts; a resumable
+                # upload picks up from its last committed chunk on re-execute
+                if attempt >= max_retries or not self._is_idempotent(request):
+                    raise
+                time.sleep(self._retry_delay(None, attempt))
+                attempt += 1
+
+    def _is_idempotent(self, request) -> bool:
+        """True for requests that can be resent safely (reads and resumable uploads)"""
+        if getattr(request, 'resumable', None) is not None:
+            return True
+        return getattr(request, 'method', None) in self.IDEMPOTENT_METHODS
+
+    def _retry_delay(self, error: Optional["HttpError"], attempt: int) -> float:
+        """Seconds to wait before retrying a failed request"""
+        retry_after = error.resp.get('retry-after') if error is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), 60)
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+        return min(2 ** attempt + random.random(), 60)
+
+    def _execute_batch(self, requests: List) -> List[tuple]:
+        """
+        Execute Drive API requests through the batch endpoint
+
+        Requests are sent 100 at a time (Drive's per-batch limit). Media
+        uploads/downloads are not supported by the batch endpoint.
+
+        Args:
+            requests: Unexecuted googleapiclient HttpRequest objects
+
+        Returns:
+            List of (response, exception) tuples in the same order as requests
+        """
+        results = [(None, None)] * len(requests)
+
+        def callback(request_id, response, exception):
+            results[int(request_id)] = (response, exception)
+
+        for start in range(0, len(requests), self.BATCH_SIZE):
+            # Uses the per-API batch URL (batch/drive/v3) from the discovery document
+            batch = self.service.new_batch_http_request(callback=callback)
+            for index in range(start, min(start + self.BATCH_SIZE, len(requests))):
+                batch.add(requests[index], request_id=str(index))
+            self._execute_with_retry(batch)
+
+        return results
+
+    def share_files_batch(self, items: List[tuple]) -> List[Dict]:
+        """
+        Share many files/folders in batched round trips
+
+        Args:
+            items: List of (file_id, email, role) tuples
+
+        Returns:
+            Permission metadata per item, in order. Failures are returned as {'error': message}.
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated")
+
+        requests = [
+            self.service.permissions().create(
+                fileId=file_id,
+                body={'type': 'user', 'role': role, 'emailAddress': email},
+                fields='id',
+                **self.ALL_DRIVES
+            )
+            for file_id, email, role in items
+        ]
+
+        try:
+            return [
+                {'error': str(exception)} if exception else response
+                for response, exception in self._execute_batch(requests)
+            ]
+        except HttpError as error:
+            raise RuntimeError(f"Failed to share files: {error}")
+
+    def delete_files_batch(self, file_ids: List[str]) -> Dict[str, bool]:
+        """
+        Delete many files in batched round trips
+
+        Args:
+            file_ids: File IDs to delete
+
+        Returns:
+            Dict mapping file ID to True if deleted
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated")
+
+        requests = [self.service.files().delete(fileId=file_id, **self.ALL_DRIVES) for file_id in file_ids]
+
+        try:
+            results = self._execute_batch(requests)
+        except HttpError as error:
+            raise RuntimeError(f"Failed to delete files: {error}")
+
+        self._invalidate_list_cache()
+
+        return {
+            file_id: exception is None
+            for file_id, (_, exception) in zip(file_ids, results)
+        }
+
+    def get_files_metadata_batch(self, file_ids: List[str], fields: str = None) -> Dict[str, Optional[Dict]]:
+        """
+        Get metadata for many files in batched round trips
+
+        Args:
+            file_ids: Google Drive file IDs
+            fields: Partial-response fields (defaults to METADATA_FIELDS)
+
+        Returns:
+            Dict mapping file ID to metadata (None if the lookup failed)
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated")
+
+        requests = [
+            self.service.files().get(
+                fileId=file_id,
+                fields=fields or self.METADATA_FIELDS,
+                **self.ALL_DRIVES
+            )
+            for file_id in file_ids
+        ]
+
+        try:
+            results = self._execute_batch(requests)
+        except HttpError as error:
+            raise RuntimeError(f"Failed to get file metadata: {error}")
+
+        return {
+            file_id: None if exception else response
+            for file_id, (response, exception) in zip(file_ids, results)
+        }
+
     def _get_mime_type(self, file_path: str) -> str:
         """Get MIME type from file extension"""
-        import mimetypes
-        mime_type, _ = mimetypes.guess_type(file_path)
-        return mime_type or 'application/octet-stream'
+        return _mime_for_ext(os.path.splitext(file_path)[1])
 
     # ========================================================================
     # Daycare-Specific Methods (Production Features)
@@ -459,10 +1261,17 @@ class GoogleDriveService:
             parent_folder_id=root_folder_id
         )
 
-        # Create subfolders
-        self.create_folder('photos', parent_folder_id=daycare_folder['id'])
-        self.create_folder('documents', parent_folder_id=daycare_folder['id'])
-        self.create_folder('exports', parent_folder_id=daycare_folder['id'])
+        # Any cached base folder for this daycare is now stale
+        with self._folder_cache_lock:
+            self._daycare_folder_cache.pop(daycare_id, None)
+
+        # Create subfolders concurrently (one round trip instead of three)
+        subfolders = ['photos', 'documents', 'exports']
+        with ThreadPoolExecutor(max_workers=len(subfolders)) as executor:
+            list(executor.map(
+                lambda name: self.create_folder(name, parent_folder_id=daycare_folder['id']),
+                subfolders
+            ))
 
         return daycare_folder
 
@@ -471,7 +1280,8 @@ class GoogleDriveService:
         daycare_id: int,
         file_content: BinaryIO,
         file_name: str,
-        year_month: str = None
+        year_month: str = None,
+        db=None
     ) -> Dict:
         """
         Upload photo to daycare's folder with date organization
@@ -481,6 +1291,7 @@ class GoogleDriveService:
             file_content: Photo file content
             file_name: Photo filename
             year_month: Optional year-month (e.g., '2025-01') for organization
+            db: Optional open database session to reuse for the folder lookup
 
         Returns:
             Dict with uploaded file information
@@ -488,56 +1299,228 @@ class GoogleDriveService:
         if not self.service:
             raise RuntimeError("Not authenticated. Call authenticate() first")
 
-        # Get daycare folder ID from database
+        target_folder_id = self._resolve_photo_folder_id(daycare_id, year_month, db)
+
+        # Upload file
+        result = self.upload_file(
+            file_content=file_content,
+            file_name=file_name,
+            folder_id=target_folder_id
+        )
+
+        return result
+
+    def upload_photos_for_daycare(self, daycare_id: int, items: List[Dict], max_workers: int = None) -> List[Dict]:
+        """
+        Upload many photos to a daycare's folders concurrently
+
+        The daycare folder is resolved once with a single database session and
+        each distinct year-month folder once, then uploads run on a thread pool.
+
+        Args:
+            daycare_id: Daycare ID
+            items: List of dicts with file_content, file_name and optional year_month
+            max_workers: Thread pool size (defaults to self.max_workers)
+
+        Returns:
+            List of uploaded file metadata in the same order as items.
+            Failed uploads are returned as {'error': message}.
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated. Call authenticate() first")
+
+        from app.database import get_db
+
+        with get_db() as db:
+            folder_ids = {
+                year_month: self._resolve_photo_folder_id(daycare_id, year_month, db)
+                for year_month in {item.get('year_month') for item in items}
+            }
+
+        return self.upload_many(
+            [
+                {
+                    'file_content': item['file_content'],
+                    'file_name': item['file_name'],
+                    'folder_id': folder_ids[item.get('year_month')]
+                }
+                for item in items
+            ],
+            max_workers=max_workers
+        )
+
+    def enqueue_photo_upload(
+        self,
+        daycare_id: int,
+        raw_bytes: bytes,
+        file_name: str,
+        year_month: str = None
+    ) -> Future:
+        """
+        Queue a photo for EXIF stripping and upload on a background worker
+
+        The caller returns immediately; re-encoding and the Drive round trips
+        happen off the request thread.
+
+        Args:
+            daycare_id: Daycare ID
+            raw_bytes: Original image bytes as uploaded
+            file_name: Photo filename
+            year_month: Optional year-month (e.g., '2025-01') for organization
+
+        Returns:
+            Future resolving to the uploaded file information
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated. Call authenticate() first")
+
+        with self._background_executor_lock:
+            if self._background_executor is None:
+                self._background_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='gdrive-photo'
+                )
+
+        return self._background_executor.submit(
+            self._process_and_upload_photo, daycare_id, raw_bytes, file_name, year_month
+        )
+
+    def _process_and_upload_photo(self, daycare_id: int, raw_bytes: bytes, file_name: str, year_month: str = None) -> Dict:
+        """Background worker: strip metadata, then upload"""
+        try:
+            return self.upload_photo_for_daycare(
+                daycare_id=daycare_id,
+                file_content=self._strip_photo_metadata(raw_bytes),
+                file_name=file_name,
+                year_month=year_month
+            )
+        except Exception as e:
+            print(f"Background photo upload error for {file_name}: {e}")
+            raise
+
+    def _strip_photo_metadata(self, raw_bytes: bytes) -> BinaryIO:
+        """
+        Re-encode an image without EXIF/GPS metadata, keeping its orientation
+
+        Returns:
+            Stream positioned at the start of the cleaned image
+        """
+        from PIL import Image, ImageOps
+
+        with Image.open(io.BytesIO(raw_bytes)) as image:
+            image_format = image.format or 'JPEG'
+            cleaned = ImageOps.exif_transpose(image)
+
+            output = io.BytesIO()
+            if image_format == 'JPEG':
+                cleaned.save(output, format=image_format, quality=90)
+            else:
+                cleaned.save(output, format=image_format)
+
+        output.seek(0)
+        return output
+
+    def _resolve_photo_folder_id(self, daycare_id: int, year_month: str = None, db=None) -> str:
+        """
+        Resolve (creating if needed) the folder a daycare photo should be uploaded to
+
+        Args:
+            daycare_id: Daycare ID
+            year_month: Optional year-month subfolder (YYYY-MM)
+            db: Optional open database session
+
+        Returns:
+            Target folder ID
+        """
+        if year_month and not _YEAR_MONTH_PATTERN.match(year_month):
+            raise ValueError(f"year_month must be in YYYY-MM format, got {year_month!r}")
+
+        base_folder_id = self._resolve_daycare_folder_id(daycare_id, db)
+
+        # Get photos subfolder, then year-month subfolder if needed
+        photos_folder_id = self._get_or_create_subfolder(base_folder_id, 'photos')
+
+        if year_month:
+            return self._get_or_create_subfolder(photos_folder_id, year_month)
+        return photos_folder_id
+
+    def _resolve_daycare_folder_id(self, daycare_id: int, db=None) -> str:
+        """
+        Get a daycare's base Drive folder ID, caching the database lookup
+
+        Args:
+            daycare_id: Daycare ID
+            db: Optional open database session (a new one is opened if not given)
+
+        Returns:
+            Base folder ID for the daycare
+        """
+        with self._folder_cache_lock:
+            cached = self._daycare_folder_cache.get(daycare_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
         try:
             from app.database import get_db
             from app.database.models import Daycare
 
-            with get_db() as db:
-                daycare = db.query(Daycare).filter_by(id=daycare_id).first()
-                if not daycare or not daycare.google_drive_folder_id:
+            with nullcontext(db) if db is not None else get_db() as session:
+                base_folder_id = session.query(Daycare.google_drive_folder_id).filter_by(id=daycare_id).scalar()
+                if not base_folder_id:
                     raise ValueError("Daycare folder not configured")
-
-                base_folder_id = daycare.google_drive_folder_id
         except ImportError:
             # Fallback if database not available
-            base_folder_id = os.getenv('GOOGLE_DRIVE_FOLDER_ID')
+            return os.getenv('GOOGLE_DRIVE_FOLDER_ID')
 
-        # Get photos subfolder
-        folders = self.list_files(
-            folder_id=base_folder_id,
-            query="mimeType='application/vnd.google-apps.folder' and name='photos'"
-        )
+        with self._folder_cache_lock:
+            self._daycare_folder_cache[daycare_id] = (
+                base_folder_id, time.monotonic() + self.daycare_folder_cache_ttl
+            )
+        return base_folder_id
 
-        if not folders:
-            photos_folder = self.create_folder('photos', parent_folder_id=base_folder_id)
-            photos_folder_id = photos_folder['id']
-        else:
-            photos_folder_id = folders[0]['id']
+    def _get_or_create_subfolder(self, parent_folder_id: str, folder_name: str) -> str:
+        """
+        Resolve a subfolder ID by name, creating the folder if it does not exist
 
-        # Create year-month subfolder if needed
-        if year_month:
-            month_folders = self.list_files(
-                folder_id=photos_folder_id,
-                query=f"mimeType='application/vnd.google-apps.folder' and name='{year_month}'"
-            )
+        Resolved IDs are cached per (parent, name) so repeated uploads into the
+        same folder skip the Drive lookup entirely.
 
-            if not month_folders:
-                month_folder = self.create_folder(year_month, parent_folder_id=photos_folder_id)
-                target_folder_id = month_folder['id']
-            else:
-                target_folder_id = month_folders[0]['id']
-        else:
-            target_folder_id = photos_folder_id
+        Args:
+            parent_folder_id: Parent folder ID
+            folder_name: Subfolder name
 
-        # Upload file
-        result = self.upload_file(
-            file_content=file_content,
-            file_name=file_name,
-            folder_id=target_folder_id
+        Returns:
+            Subfolder ID
+        """
+        key = (parent_folder_id, folder_name)
+        with self._folder_cache_lock:
+            cached = self._folder_cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        folders = self.list_files(
+            folder_id=parent_folder_id,
+            query=_folder_query(folder_name),
+            page_size=1,
+            order_by=None,
+            fields='files(id)',
+            spaces='drive'
         )
 
-        return result
+        if folders:
+            folder_id = folders[0]['id']
+            self._cache_folder_id(parent_folder_id, folder_name, folder_id)
+            return folder_id
+
+        # create_folder records the new ID in the cache
+        return self.create_folder(folder_name, parent_folder_id=parent_folder_id)['id']
+
+    def _cache_folder_id(self, parent_folder_id: str, folder_name: str, folder_id: str):
+        """Remember a resolved subfolder ID"""
+        with self._folder_cache_lock:
+            self._folder_cache[(parent_folder_id, folder_name)] = (
+                folder_id, time.monotonic() + self.folder_cache_ttl
+            )
 
     def get_storage_usage(self, daycare_id: int) -> Dict:
         """
@@ -577,8 +1560,138 @@ class GoogleDriveService:
             }
 
 
-# Singleton instance
-_gdrive_service = None
+class AsyncGoogleDriveService:
+    """
+    Asyncio facade over GoogleDriveService
+
+    Drive calls are pure network I/O, so each call is handed to a worker thread
+    and awaited. An event loop can keep many uploads/downloads in flight at once
+    while legacy callers keep using the synchronous service directly.
+    """
+
+    def __init__(self, service: GoogleDriveService):
+        """
+        Wrap an existing Google Drive service
+
+        Args:
+            service: GoogleDriveService instance to delegate to
+        """
+        self.sync_service = service
+
+    async def authenticate(self) -> bool:
+        """Authenticate the wrapped service (see GoogleDriveService.authenticate)"""
+        return await asyncio.to_thread(self.sync_service.authenticate)
+
+    async def warmup(self) -> bool:
+        """Pre-authenticate at startup (see GoogleDriveService.warmup)"""
+        return await asyncio.to_thread(self.sync_service.warmup)
+
+    async def upload_file(self, **kwargs) -> Dict:
+        """Upload a file (see GoogleDriveService.upload_file)"""
+        return await asyncio.to_thread(self.sync_service.upload_file, **kwargs)
+
+    async def download_file(self, file_id: str, destination_path: str = None) -> Union[bytes, str]:
+        """Download a file (see GoogleDriveService.download_file)"""
+        return await asyncio.to_thread(self.sync_service.download_file, file_id, destination_path)
+
+    async def download_to_path_parallel(self, file_id: str, destination_path: str, parts: int = 4) -> str:
+        """Download a large file with ranged requests (see GoogleDriveService.download_to_path_parallel)"""
+        return await asyncio.to_thread(
+            self.sync_service.download_to_path_parallel, file_id, destination_path, parts
+        )
+
+    async def list_files(self, **kwargs) -> List[Dict]:
+        """List files (see GoogleDriveService.list_files)"""
+        return await asyncio.to_thread(self.sync_service.list_files, **kwargs)
+
+    async def create_folder(self, folder_name: str, parent_folder_id: str = None) -> Dict:
+        """Create a folder (see GoogleDriveService.create_folder)"""
+        return await asyncio.to_thread(self.sync_service.create_folder, folder_name, parent_folder_id)
+
+    async def share_file(self, file_id: str, email: str, role: str = 'reader') -> Dict:
+        """Share a file (see GoogleDriveService.share_file)"""
+        return await asyncio.to_thread(self.sync_service.share_file, file_id, email, role)
+
+    async def get_file_metadata(self, file_id: str, fields: str = None) -> Dict:
+        """Get file metadata (see GoogleDriveService.get_file_metadata)"""
+        return await asyncio.to_thread(self.sync_service.get_file_metadata, file_id, fields)
+
+    async def delete_file(self, file_id: str) -> bool:
+        """Delete a file (see GoogleDriveService.delete_file)"""
+        return await asyncio.to_thread(self.sync_service.delete_file, file_id)
+
+    async def upload_photo_for_daycare(self, **kwargs) -> Dict:
+        """Upload a daycare photo (see GoogleDriveService.upload_photo_for_daycare)"""
+        return await asyncio.to_thread(self.sync_service.upload_photo_for_daycare, **kwargs)
+
+    async def upload_photos_for_daycare(self, daycare_id: int, items: List[Dict]) -> List[Dict]:
+        """Upload many daycare photos (see GoogleDriveService.upload_photos_for_daycare)"""
+        return await asyncio.to_thread(self.sync_service.upload_photos_for_daycare, daycare_id, items)
+
+    async def share_files_batch(self, items: List[tuple]) -> List[Dict]:
+        """Share many files (see GoogleDriveService.share_files_batch)"""
+        return await asyncio.to_thread(self.sync_service.share_files_batch, items)
+
+    async def delete_files_batch(self, file_ids: List[str]) -> Dict[str, bool]:
+        """Delete many files (see GoogleDriveService.delete_files_batch)"""
+        return await asyncio.to_thread(self.sync_service.delete_files_batch, file_ids)
+
+    async def get_files_metadata_batch(self, file_ids: List[str], fields: str = None) -> Dict[str, Optional[Dict]]:
+        """Get metadata for many files (see GoogleDriveService.get_files_metadata_batch)"""
+        return await asyncio.to_thread(self.sync_service.get_files_metadata_batch, file_ids, fields)
+
+    async def upload_many(self, items: List[Dict]) -> List[Dict]:
+        """
+        Upload several files concurrently from the event loop
+
+        At most the wrapped service's max_workers uploads run at once.
+
+        Args:
+            items: List of upload_file keyword-argument dicts
+
+        Returns:
+            List of file metadata dicts in the same order as items.
+            Failed uploads are returned as {'error': message}.
+        """
+        semaphore = asyncio.Semaphore(self.sync_service.max_workers)
+
+        async def upload(item: Dict) -> Dict:
+            async with semaphore:
+                try:
+                    return await self.upload_file(**item)
+                except Exception as e:
+                    print(f"Bulk upload error for {item.get('file_name') or item.get('file_path')}: {e}")
+                    return {'error': str(e)}
+
+        return list(await asyncio.gather(*(upload(item) for item in items)))
+
+    async def download_many(self, file_ids: List[str]) -> Dict[str, Optional[bytes]]:
+        """
+        Download several files concurrently into memory from the event loop
+
+        Args:
+            file_ids: Google Drive file IDs
+
+        Returns:
+            Dict mapping file ID to file bytes (None if the download failed)
+        """
+        semaphore = asyncio.Semaphore(self.sync_service.max_workers)
+
+        async def download(file_id: str) -> Optional[bytes]:
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(self.sync_service.download_to_memory, file_id)
+                except Exception as e:
+                    print(f"Bulk download error for {file_id}: {e}")
+                    return None
+
+        results = await asyncio.gather(*(download(file_id) for file_id in file_ids))
+        return dict(zip(file_ids, results))
+
+
+# Service instances, one per configuration
+_gdrive_services: Dict[tuple, GoogleDriveService] = {}
+_gdrive_services_lock = threading.Lock()
 
 def get_google_drive_service(
     credentials_path: str = None,
@@ -587,7 +1700,7 @@ def get_google_drive_service(
     mode: str = None
 ) -> GoogleDriveService:
     """
-    Get Google Drive service instance (singleton)
+    Get Google Drive service instance (one shared instance per configuration)
 
     Args:
         credentials_path: Path to OAuth credentials file
@@ -598,12 +1711,31 @@ def get_google_drive_service(
     Returns:
         GoogleDriveService instance
     """
-    global _gdrive_service
-    if _gdrive_service is None:
-        _gdrive_service = GoogleDriveService(
-            credentials_path=credentials_path,
-            token_path=token_path,
-            service_account_path=service_account_path,
-            mode=mode
-        )
-    return _gdrive_service
+    key = (credentials_path, token_path, service_account_path, mode)
+
+    service = _gdrive_services.get(key)
+    if service is None:
+        with _gdrive_services_lock:
+            service = _gdrive_services.get(key)
+            if service is None:
+                service = GoogleDriveService(
+                    credentials_path=credentials_path,
+                    token_path=token_path,
+                    service_account_path=service_account_path,
+                    mode=mode
+                )
+                _gdrive_services[key] = service
+    return service
+
+
+def get_async_google_drive_service(**kwargs) -> AsyncGoogleDriveService:
+    """
+    Get an asyncio facade over the Google Drive service singleton
+
+    Args:
+        **kwargs: Passed through to get_google_drive_service
+
+    Returns:
+        AsyncGoogleDriveService instance
+    """
+    return AsyncGoogleDriveService(get_google_drive_service(**kwargs))
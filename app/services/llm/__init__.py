@@ -1,4 +1,5 @@
 """LLM Service - Swappable AI providers"""
+import threading
 from app.config import Config
 
 
@@ -40,11 +41,14 @@ class LLMService:
 
 # Singleton instance
 _llm_service = None
+_llm_service_lock = threading.Lock()
 
 
 def get_llm_service():
-    """Get LLM service singleton"""
+    """Get LLM service singleton (thread-safe)"""
     global _llm_service
     if _llm_service is None:
-        _llm_service = LLMService()
+        with _llm_service_lock:
+            if _llm_service is None:
+                _llm_service = LLMService()
     return _llm_service
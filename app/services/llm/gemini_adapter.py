@@ -1,56 +1,99 @@
 """Google Gemini LLM Adapter"""
-import google.generativeai as genai
+import asyncio
+
 from app.config import Config
 
+# google.generativeai is slow to import; loaded on first adapter construction
+_genai = None
+
+
+def _load_genai():
+    """Import the Gemini SDK once per process"""
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        _genai = genai
+    return _genai
+
 
 class GeminiAdapter:
     """Google Gemini API adapter"""
 
     def __init__(self):
-        genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self._genai = _load_genai()
+        self._genai.configure(api_key=Config.GEMINI_API_KEY)
+        self.model = self._genai.GenerativeModel('gemini-1.5-flash')
 
-    def chat(self, messages, system_prompt=None, temperature=0.7):
-        """Send chat messages and get response"""
-        # Combine system prompt with messages
-        prompt = ""
-        if system_prompt:
-            prompt = f"{system_prompt}\n\n"
+    @staticmethod
+    def _build_prompt(messages, system_prompt=None):
+        """Combine system prompt and conversation into a single prompt string"""
+        parts = [f"{system_prompt}\n\n"] if system_prompt else []
 
         if isinstance(messages, str):
-            prompt += messages
+            parts.append(messages)
         else:
             # Format conversation
-            for msg in messages:
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                prompt += f"{role}: {content}\n"
+            parts.extend(
+                f"{msg.get('role', 'user')}: {msg.get('content', '')}\n"
+                for msg in messages
+            )
+
+        return "".join(parts)
+
+    def _generation_config(self, temperature, response_schema=None):
+        """
+        Generation settings; a response_schema switches on JSON output
+
+        Gemini's schema dialect differs from JSON Schema (no type unions),
+        so only the JSON MIME type is requested and the prompt carries the shape.
+        """
+        if response_schema:
+            return self._genai.types.GenerationConfig(
+                temperature=temperature,
+                response_mime_type="application/json"
+            )
+        return self._genai.types.GenerationConfig(temperature=temperature)
+
+    def chat(self, messages, system_prompt=None, temperature=0.7, response_schema=None):
+        """Send chat messages and get response (JSON if response_schema is given)"""
+        prompt = self._build_prompt(messages, system_prompt)
 
         response = self.model.generate_content(
             prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=temperature
-            )
+            generation_config=self._generation_config(temperature, response_schema)
         )
 
         return response.text
 
-    def stream_chat(self, messages, system_prompt=None):
-        """Stream chat responses"""
-        prompt = ""
-        if system_prompt:
-            prompt = f"{system_prompt}\n\n"
+    async def achat(self, messages, system_prompt=None, temperature=0.7, response_schema=None):
+        """
+        Async variant of chat, so many requests can be in flight at once
 
-        if isinstance(messages, str):
-            prompt += messages
-        else:
-            for msg in messages:
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                prompt += f"{role}: {content}\n"
+        Runs the sync client on a worker thread: the SDK's async client is cached
+        per model and process and bound to the first event loop that used it,
+        while each batch runs on a fresh loop.
+        """
+        return await asyncio.to_thread(self.chat, messages, system_prompt, temperature, response_schema)
+
+    def stream_chat(self, messages, system_prompt=None, temperature=0.7):
+        """Stream chat responses"""
+        prompt = self._build_prompt(messages, system_prompt)
 
-        response = self.model.generate_content(prompt, stream=True)
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self._generation_config(temperature),
+            stream=True
+        )
 
         for chunk in response:
             if chunk.text:
                 yield chunk.text
+
+    async def astream_chat(self, messages, system_prompt=None, temperature=0.7):
+        """Async variant of stream_chat (sync stream on worker threads, see achat)"""
+        chunks = self.stream_chat(messages, system_prompt, temperature)
+        while True:
+            text = await asyncio.to_thread(next, chunks, None)
+            if text is None:
+                break
+            yield text
@@ -0,0 +1,29 @@
+"""Shared HTTP connection pool for LLM provider SDKs"""
+import atexit
+import threading
+
+import httpx
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Get the process-wide httpx.Client used by sync provider SDK clients
+
+    Every adapter instance reuses the same keep-alive pool, so repeat calls
+    skip the TCP + TLS handshake. Only the sync client is shared: an async
+    client's connections belong to the event loop that opened them.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    timeout=httpx.Timeout(600.0, connect=5.0),
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                    follow_redirects=True
+                )
+                atexit.register(_client.close)
+    return _client
@@ -1,60 +1,188 @@
 """OpenAI LLM Adapter"""
-from openai import OpenAI
+import asyncio
+import json
+import threading
 from app.config import Config
 
 
 class OpenAIAdapter:
     """OpenAI API adapter"""
 
+    # chat/achat are retried by LLMService (rate limiter aware), so the clients are
+    # built without SDK retries; calls LLMService doesn't retry ask for these
+    SDK_MAX_RETRIES = 2
+
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        # Deferred so processes using another provider never import the SDK
+        from openai import OpenAI
+        from .http_client import get_http_client
+        self.client = OpenAI(api_key=Config.OPENAI_API_KEY, http_client=get_http_client(), max_retries=0)
         self.model = "gpt-4o"
+        # AsyncOpenAI's connection pool belongs to the event loop that opened it, and
+        # each batch runs on its own loop, so async clients are kept per loop
+        self._async_clients = {}  # event loop -> AsyncOpenAI
+        self._async_clients_lock = threading.Lock()
+
+    @staticmethod
+    def _format_messages(messages, system_prompt=None):
+        """Build the chat messages list, forwarding an existing list untouched when possible"""
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
 
-    def chat(self, messages, system_prompt=None, temperature=0.7):
-        """Send chat messages and get response"""
-        formatted_messages = []
+        if not system_prompt:
+            # The SDK doesn't mutate its input, so no copy is needed
+            return messages
 
-        if system_prompt:
-            formatted_messages.append({"role": "system", "content": system_prompt})
+        return [{"role": "system", "content": system_prompt}, *messages]
 
-        if isinstance(messages, str):
-            formatted_messages.append({"role": "user", "content": messages})
-        else:
-            formatted_messages.extend(messages)
+    @staticmethod
+    def _response_format(response_schema):
+        """Structured-output request options for a JSON schema (none if no schema)"""
+        if not response_schema:
+            return {}
+        return {
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": response_schema, "strict": True}
+            }
+        }
+
+    def chat(self, messages, system_prompt=None, temperature=0.7, response_schema=None):
+        """Send chat messages and get response (JSON matching response_schema if given)"""
+        formatted_messages = self._format_messages(messages, system_prompt)
 
         response = self.client.chat.completions.create(
             model=self.model,
             messages=formatted_messages,
-            temperature=temperature
+            temperature=temperature,
+            **self._response_format(response_schema)
         )
 
         return response.choices[0].message.content
 
-    def stream_chat(self, messages, system_prompt=None):
-        """Stream chat responses"""
-        formatted_messages = []
+    async def achat(self, messages, system_prompt=None, temperature=0.7, response_schema=None):
+        """Async variant of chat, so many requests can be in flight at once"""
+        response = await self._get_async_client().chat.completions.create(
+            model=self.model,
+            messages=self._format_messages(messages, system_prompt),
+            temperature=temperature,
+            **self._response_format(response_schema)
+        )
 
-        if system_prompt:
-            formatted_messages.append({"role": "system", "content": system_prompt})
+        return response.choices[0].message.content
 
-        if isinstance(messages, str):
-            formatted_messages.append({"role": "user", "content": messages})
-        else:
-            formatted_messages.extend(messages)
+    async def abatch_chat(self, requests, poll_interval=30):
+        """
+        Run many chat requests through the Batch API
+
+        Batches are billed at half price and complete within 24 hours, so this
+        suits end-of-day jobs rather than anything a user is waiting on.
+
+        Args:
+            requests: List of dicts with messages and optional system_prompt,
+                temperature and response_schema (same meaning as chat)
+            poll_interval: Seconds between batch status checks
 
-        stream = self.client.chat.completions.create(
+        Returns:
+            Response text per request, in order (None where a request failed)
+        """
+        client = self._get_async_client().with_options(max_retries=self.SDK_MAX_RETRIES)
+
+        lines = []
+        for index, request in enumerate(requests):
+            body = {
+                "model": self.model,
+                "messages": self._format_messages(request["messages"], request.get("system_prompt")),
+                "temperature": request.get("temperature", 0.7),
+                **self._response_format(request.get("response_schema"))
+            }
+            lines.append(json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+
+        input_file = await client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+
+        results = [None] * len(requests)
+        if not batch.output_file_id:
+            return results
+
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            item = json.loads(line)
+            choices = ((item.get("response") or {}).get("body") or {}).get("choices")
+            if choices:
+                results[int(item["custom_id"])] = choices[0]["message"]["content"]
+
+        return results
+
+    def _get_async_client(self):
+        """Async client for the running event loop, created on first use in that loop"""
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                from openai import AsyncOpenAI
+                # Clients of finished loops can't be used (or awaited closed) again
+                for stale_loop in [other for other in self._async_clients if other.is_closed()]:
+                    del self._async_clients[stale_loop]
+                client = self._async_clients[loop] = AsyncOpenAI(api_key=Config.OPENAI_API_KEY, max_retries=0)
+        return client
+
+    def stream_chat(self, messages, system_prompt=None, temperature=0.7):
+        """Stream chat responses"""
+        formatted_messages = self._format_messages(messages, system_prompt)
+
+        stream = self.client.with_options(max_retries=self.SDK_MAX_RETRIES).chat.completions.create(
             model=self.model,
             messages=formatted_messages,
+            temperature=temperature,
             stream=True
         )
 
         for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+            # Resolve the delta once per chunk; some chunks (e.g. usage) carry no choices
+            choices = chunk.choices
+            if choices:
+                content = choices[0].delta.content
+                if content:
+                    yield content
+
+    async def astream_chat(self, messages, system_prompt=None, temperature=0.7):
+        """Async variant of stream_chat"""
+        stream = await self._get_async_client().with_options(
+            max_retries=self.SDK_MAX_RETRIES
+        ).chat.completions.create(
+            model=self.model,
+            messages=self._format_messages(messages, system_prompt),
+            temperature=temperature,
+            stream=True
+        )
+
+        async for chunk in stream:
+            choices = chunk.choices
+            if choices:
+                content = choices[0].delta.content
+                if content:
+                    yield content
 
     def generate_image(self, prompt):
         """Generate image from prompt"""
-        response = self.client.images.generate(
+        response = self.client.with_options(max_retries=self.SDK_MAX_RETRIES).images.generate(
             model="dall-e-3",
             prompt=prompt,
             size="1024x1024",
@@ -3,15 +3,171 @@ LLM Service - Unified interface for AI providers (OpenAI and Gemini)
 Generates activity descriptions and analyzes photos for daycare management
 """
 
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
 from typing import Optional, Dict, List
 from app.config import Config
 from app.services.llm.openai_adapter import OpenAIAdapter
 from app.services.llm.gemini_adapter import GeminiAdapter
 
 
+# System prompts (fixed per task; only the user prompt varies per call)
+_SYS_DESC = """You are a warm, professional daycare teacher writing photo descriptions for parents.
+Your descriptions should be:
+- Natural and engaging (like a teacher would describe)
+- 1-2 sentences maximum
+- Focus on the child's activity and mood
+- Use positive, warm language
+- Avoid generic phrases like "captured" or "photo shows"
+- Write as if you witnessed the moment
+
+Examples:
+- "Emma is enjoying her healthy lunch with friends at the table!"
+- "Building colorful towers during creative play time - Emma loves the blue blocks!"
+- "Peaceful nap time for Emma after an active morning"
+- "Emma is having so much fun painting during art activities!"
+"""
+
+_SYS_ANALYZE = """You are an AI assistant that analyzes daycare photos to categorize activities.
+Analyze the provided information and determine the activity type.
+
+Activity types:
+- meal: Eating, lunch, snack time, drinking
+- nap: Sleeping, resting, quiet time
+- play: Playing with toys, free play, recreational activities
+- learning: Educational activities, reading, structured learning
+- outdoor: Outside activities, playground, nature walks
+- art: Drawing, painting, crafts, creative projects
+- other: Any activity that doesn't fit above categories
+
+Respond in JSON format:
+{
+    "activity_type": "meal|nap|play|learning|outdoor|art|other",
+    "confidence": 0.0-1.0,
+    "mood": "happy|calm|focused|sleepy|excited|curious",
+    "suggested_duration": minutes (null if not applicable)
+}"""
+
+_SYS_SUMMARY = """You are a caring daycare teacher writing a daily summary for parents.
+Write in a warm, personal tone as if you're talking directly to the parent.
+Keep it conversational and highlight the child's day in 2-3 sentences.
+Focus on positive moments and development."""
+
+_SYS_ENHANCE = """You are a daycare teacher enhancing activity notes.
+Make them warmer and more detailed while keeping them concise.
+Maximum 1-2 sentences."""
+
+# Descriptions used when a photo has no context beyond the child's name
+_NO_CONTEXT_TEMPLATES = (
+    "{name} is having a wonderful moment at daycare!",
+    "{name} is enjoying the day with friends!",
+    "Another happy moment for {name} at daycare today!",
+    "{name} is having so much fun with us today!",
+)
+
+# Fallback (activity_type, mood) by hour, used when activity analysis fails
+_HOUR_TO_DEFAULT_ACTIVITY = tuple(
+    ("outdoor", "excited") if 9 <= hour <= 10
+    else ("meal", "happy") if 11 <= hour <= 13
+    else ("nap", "calm") if 14 <= hour <= 15
+    else ("play", "happy")
+    for hour in range(24)
+)
+
+# Structured output for analyze_photo_activity (provider JSON mode)
+_ACTIVITY_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "activity_type": {
+            "type": "string",
+            "enum": ["meal", "nap", "play", "learning", "outdoor", "art", "other"]
+        },
+        "confidence": {"type": "number"},
+        "mood": {
+            "type": "string",
+            "enum": ["happy", "calm", "focused", "sleepy", "excited", "curious"]
+        },
+        "suggested_duration": {"type": ["integer", "null"]}
+    },
+    "required": ["activity_type", "confidence", "mood", "suggested_duration"],
+    "additionalProperties": False
+}
+
+
+class AsyncTokenBucket:
+    """
+    Client-side requests-per-minute and tokens-per-minute limiter
+
+    Callers reserve capacity up front; when a bucket runs dry the balance goes
+    negative and each caller sleeps until its share has refilled, which paces
+    bursts (e.g. asyncio.gather over a batch) just under the provider limit
+    instead of triggering 429 storms. State is guarded by a threading lock so
+    one bucket can be shared by sync callers and by any event loop.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Take one request and `tokens` tokens; return seconds to wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+
+            delay = 0.0
+            if self.rpm > 0:
+                self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60) - 1
+                delay = max(delay, -self._requests * 60 / self.rpm)
+            if self.tpm > 0:
+                self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60) - min(tokens, self.tpm)
+                delay = max(delay, -self._tokens * 60 / self.tpm)
+            return delay
+
+    async def acquire(self, tokens: int = 0):
+        """Wait (without blocking the event loop) until the request may be sent"""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_blocking(self, tokens: int = 0):
+        """Synchronous variant of acquire"""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+
 class LLMService:
     """Unified LLM service with provider abstraction"""
 
+    # Exact-match response cache (identical prompts skip the LLM round trip)
+    RESPONSE_CACHE_SIZE = 4096
+    RESPONSE_CACHE_TTL = 24 * 3600
+
+    # Prompts carry this in place of the child's name and the name is filled
+    # back into the answer, so prompts that differ only by name share one
+    # cache entry and only the name the prompt injected is ever substituted
+    CHILD_SENTINEL = "[CHILD]"
+
+    # Transient provider failures (rate limits, 5xx, dropped connections) are
+    # retried with jittered exponential backoff before falling back
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+    MAX_RETRIES = 3
+
+    # Rough completion size used when reserving tokens-per-minute capacity
+    ESTIMATED_RESPONSE_TOKENS = 256
+
     def __init__(self):
         """Initialize LLM service with configured provider"""
         self.provider = Config.LLM_PROVIDER.lower()
@@ -23,6 +179,14 @@ class LLMService:
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
+        # cache key -> (response, expires_at), least recently used first
+        self._response_cache: OrderedDict = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        self._rate_limiter = AsyncTokenBucket(rpm=Config.LLM_RPM, tpm=Config.LLM_TPM)
+
     def generate_activity_description(
         self,
         photo_context: Dict[str, any]
@@ -36,10 +200,221 @@ class LLMService:
                 - detected_objects: List of objects/activities detected (optional)
                 - time_of_day: Time photo was taken (optional)
                 - location: Location if available (optional)
+                - photo_id: Photo ID, picks the canned description when there is
+                  no other context (optional)
 
         Returns:
             Natural language description of the activity
         """
+        templated = self._no_context_description(photo_context)
+        if templated:
+            return templated
+
+        request = self._activity_description_request(photo_context)
+
+        try:
+            description = self._chat(**request)
+            return description.strip()
+        except Exception as e:
+            print(f"Error generating description: {e}")
+            return f"{photo_context.get('child_name', 'the child')} during activities at daycare"
+
+    async def agenerate_activity_description(self, photo_context: Dict[str, any]) -> str:
+        """Async variant of generate_activity_description"""
+        templated = self._no_context_description(photo_context)
+        if templated:
+            return templated
+
+        request = self._activity_description_request(photo_context)
+
+        try:
+            description = await self._achat(**request)
+            return description.strip()
+        except Exception as e:
+            print(f"Error generating description: {e}")
+            return f"{photo_context.get('child_name', 'the child')} during activities at daycare"
+
+    def _chat(
+        self,
+        messages,
+        system_prompt=None,
+        temperature=0.7,
+        child_name: str = None,
+        response_schema: Dict = None,
+        cache_messages=None
+    ) -> str:
+        """
+        adapter.chat with the response cache in front
+
+        The prompt refers to the child as CHILD_SENTINEL; the answer is cached
+        as the model wrote it and child_name is filled in on the way out.
+        cache_messages, if given, is hashed instead of messages so equivalent
+        prompts share an entry.
+        """
+        key = self._response_cache_key(
+            messages if cache_messages is None else cache_messages, system_prompt, temperature
+        )
+        cached = self._get_cached_response(key)
+        if cached is not None:
+            return self._fill_child_name(cached, child_name)
+
+        estimated_tokens = self._estimate_tokens(messages, system_prompt)
+        attempt = 0
+        while True:
+            self._rate_limiter.acquire_blocking(estimated_tokens)
+            try:
+                response = self.adapter.chat(
+                    messages=messages,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    response_schema=response_schema
+                )
+                break
+            except Exception as e:
+                if attempt >= self.MAX_RETRIES or not self._is_transient(e):
+                    raise
+                time.sleep(self._retry_delay(e, attempt))
+                attempt += 1
+
+        self._cache_response(key, response)
+        return self._fill_child_name(response, child_name)
+
+    async def _achat(
+        self,
+        messages,
+        system_prompt=None,
+        temperature=0.7,
+        child_name: str = None,
+        response_schema: Dict = None,
+        cache_messages=None
+    ) -> str:
+        """adapter.achat with the response cache in front (see _chat)"""
+        key = self._response_cache_key(
+            messages if cache_messages is None else cache_messages, system_prompt, temperature
+        )
+        cached = self._get_cached_response(key)
+        if cached is not None:
+            return self._fill_child_name(cached, child_name)
+
+        estimated_tokens = self._estimate_tokens(messages, system_prompt)
+        attempt = 0
+        while True:
+            await self._rate_limiter.acquire(estimated_tokens)
+            try:
+                response = await self.adapter.achat(
+                    messages=messages,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    response_schema=response_schema
+                )
+                break
+            except Exception as e:
+                if attempt >= self.MAX_RETRIES or not self._is_transient(e):
+                    raise
+                await asyncio.sleep(self._retry_delay(e, attempt))
+                attempt += 1
+
+        self._cache_response(key, response)
+        return self._fill_child_name(response, child_name)
+
+    def _estimate_tokens(self, messages, system_prompt) -> int:
+        """Approximate prompt + completion tokens (about 4 characters per token)"""
+        prompt = messages if isinstance(messages, str) else json.dumps(messages)
+        return (len(prompt) + len(system_prompt or '')) // 4 + self.ESTIMATED_RESPONSE_TOKENS
+
+    def _is_transient(self, error: Exception) -> bool:
+        """True for rate limits, 5xx responses, timeouts and dropped connections"""
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            return True
+        # openai errors carry status_code; google.api_core errors carry code
+        status = getattr(error, 'status_code', None) or getattr(error, 'code', None)
+        if isinstance(status, int):
+            return status in self.RETRYABLE_STATUSES
+        # openai.APIConnectionError / APITimeoutError have no status
+        return type(error).__name__ in ('APIConnectionError', 'APITimeoutError')
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Seconds to wait before retrying, honoring Retry-After when the provider sends it"""
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        retry_after = headers.get('retry-after')
+        if retry_after:
+            try:
+                return min(float(retry_after), 30)
+            except ValueError:
+                pass
+        return min(0.25 * 2 ** attempt + random.random() * 0.25, 4)
+
+    def _fill_child_name(self, text: str, child_name: Optional[str]) -> str:
+        """Replace CHILD_SENTINEL in text with the child's name"""
+        if not text or child_name is None:
+            return text
+        return text.replace(self.CHILD_SENTINEL, child_name)
+
+    def _response_cache_key(self, messages, system_prompt, temperature) -> bytes:
+        """Hash everything that determines the response"""
+        prompt = messages if isinstance(messages, str) else json.dumps(messages, sort_keys=True)
+        raw = f"{system_prompt or ''}\x1e{prompt}\x1e{temperature}\x1e{self.provider}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+    def _get_cached_response(self, key: bytes) -> Optional[str]:
+        """Return a live cached response, or None"""
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._response_cache[key]
+                entry = None
+            if entry is None:
+                self._cache_misses += 1
+                return None
+            self._cache_hits += 1
+            self._response_cache.move_to_end(key)
+            return entry[0]
+
+    def cache_stats(self) -> Dict[str, any]:
+        """
+        Response cache counters
+
+        Returns:
+            Dictionary with hits, misses, hit_rate (0-1) and current size
+        """
+        with self._response_cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_rate": self._cache_hits / lookups if lookups else 0.0,
+                "size": len(self._response_cache)
+            }
+
+    def _cache_response(self, key: bytes, response: str):
+        """Store a response, evicting the least recently used entries past RESPONSE_CACHE_SIZE"""
+        if not response:
+            return
+        with self._response_cache_lock:
+            self._response_cache[key] = (response, time.monotonic() + self.RESPONSE_CACHE_TTL)
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _no_context_description(self, photo_context: Dict[str, any]) -> Optional[str]:
+        """
+        Canned description when there is nothing for the LLM to describe
+
+        With no time, location or detected objects the model can only restate
+        the child's name, so skip the round trip and use a template instead.
+        """
+        if any(photo_context.get(field) for field in ('time_of_day', 'location', 'detected_objects')):
+            return None
+
+        child_name = photo_context.get('child_name', 'the child')
+        # Stable across processes (str hash() is salted per process); photos of the
+        # same child get different templates when the photo id is known
+        key = photo_context.get('photo_id') or child_name
+        template = _NO_CONTEXT_TEMPLATES[zlib.crc32(str(key).encode()) % len(_NO_CONTEXT_TEMPLATES)]
+        return template.format(name=child_name)
+
+    def _activity_description_request(self, photo_context: Dict[str, any]) -> Dict:
+        """Build chat arguments for generate_activity_description"""
         child_name = photo_context.get('child_name', 'the child')
         time_of_day = photo_context.get('time_of_day', '')
         location = photo_context.get('location', '')
@@ -56,39 +431,19 @@ class LLMService:
 
         context_str = ". ".join(context_parts) if context_parts else "No additional context"
 
-        system_prompt = """You are a warm, professional daycare teacher writing photo descriptions for parents.
-Your descriptions should be:
-- Natural and engaging (like a teacher would describe)
-- 1-2 sentences maximum
-- Focus on the child's activity and mood
-- Use positive, warm language
-- Avoid generic phrases like "captured" or "photo shows"
-- Write as if you witnessed the moment
-
-Examples:
-- "Emma is enjoying her healthy lunch with friends at the table!"
-- "Building colorful towers during creative play time - Emma loves the blue blocks!"
-- "Peaceful nap time for Emma after an active morning"
-- "Emma is having so much fun painting during art activities!"
-"""
-
         user_prompt = f"""Generate a warm, natural description for this daycare photo.
 
-Child: {child_name}
+Child: {self.CHILD_SENTINEL}
 Context: {context_str}
 
 Write as if you're the teacher sharing this moment with the parents. Keep it brief and warm."""
 
-        try:
-            description = self.adapter.chat(
-                messages=user_prompt,
-                system_prompt=system_prompt,
-                temperature=0.7
-            )
-            return description.strip()
-        except Exception as e:
-            print(f"Error generating description: {e}")
-            return f"{child_name} during activities at daycare"
+        return {
+            'messages': user_prompt,
+            'system_prompt': _SYS_DESC,
+            'temperature': 0.7,
+            'child_name': child_name
+        }
 
     def analyze_photo_activity(
         self,
@@ -109,85 +464,171 @@ Write as if you're the teacher sharing this moment with the parents. Keep it bri
                 - confidence: Confidence score (0-1)
                 - mood: Detected mood/emotion (happy, calm, focused, etc.)
                 - suggested_duration: Estimated duration in minutes (for activities like naps)
+                - fallback: True when the model could not be reached and the values
+                  are a time-of-day guess (only present then)
         """
-        child_name = photo_data.get('child_name', 'the child')
-        time_of_day = photo_data.get('time_of_day', '')
-        detected_objects = photo_data.get('detected_objects', [])
+        request = self._photo_activity_request(photo_data)
 
-        system_prompt = """You are an AI assistant that analyzes daycare photos to categorize activities.
-Analyze the provided information and determine the activity type.
+        try:
+            response = self._chat(**request)
+            return self._parse_photo_activity(response)
+        except Exception as e:
+            print(f"Error analyzing photo activity: {e}")
+            return self._default_photo_activity(photo_data.get('time_of_day', ''))
 
-Activity types:
-- meal: Eating, lunch, snack time, drinking
-- nap: Sleeping, resting, quiet time
-- play: Playing with toys, free play, recreational activities
-- learning: Educational activities, reading, structured learning
-- outdoor: Outside activities, playground, nature walks
-- art: Drawing, painting, crafts, creative projects
-- other: Any activity that doesn't fit above categories
+    async def aanalyze_photo_activity(self, photo_data: Dict[str, any]) -> Dict[str, any]:
+        """Async variant of analyze_photo_activity"""
+        request = self._photo_activity_request(photo_data)
 
-Respond in JSON format:
-{
-    "activity_type": "meal|nap|play|learning|outdoor|art|other",
-    "confidence": 0.0-1.0,
-    "mood": "happy|calm|focused|sleepy|excited|curious",
-    "suggested_duration": minutes (null if not applicable)
-}"""
+        try:
+            response = await self._achat(**request)
+            return self._parse_photo_activity(response)
+        except Exception as e:
+            print(f"Error analyzing photo activity: {e}")
+            return self._default_photo_activity(photo_data.get('time_of_day', ''))
 
-        context_str = f"Time: {time_of_day}. " if time_of_day else ""
-        if detected_objects:
-            context_str += f"Visible: {', '.join(detected_objects)}"
+    async def abatch_analyze_photo_activity(
+        self,
+        photos_data: List[Dict[str, any]],
+        max_concurrency: int = None
+    ) -> List[Dict[str, any]]:
+        """
+        Analyze many photos concurrently
 
-        user_prompt = f"""Analyze this daycare moment for {child_name}.
-{context_str}
+        Args:
+            photos_data: List of photo_data dicts (see analyze_photo_activity)
+            max_concurrency: Requests in flight at once (defaults to Config.LLM_CONCURRENCY)
 
-Provide JSON with activity_type, confidence, mood, and suggested_duration."""
+        Returns:
+            Analysis dicts in the same order as photos_data
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or Config.LLM_CONCURRENCY)
 
-        try:
-            response = self.adapter.chat(
-                messages=user_prompt,
-                system_prompt=system_prompt,
-                temperature=0.3  # Lower temperature for more consistent categorization
-            )
+        async def analyze(photo_data: Dict[str, any]) -> Dict[str, any]:
+            async with semaphore:
+                return await self.aanalyze_photo_activity(photo_data)
+
+        return list(await asyncio.gather(*(analyze(photo_data) for photo_data in photos_data)))
+
+    async def abatch_analyze_photo_activity_offline(
+        self,
+        photos_data: List[Dict[str, any]]
+    ) -> List[Dict[str, any]]:
+        """
+        Analyze many photos in one provider batch job (for end-of-day processing)
 
-            # Parse JSON response
-            import json
-            # Extract JSON from response (handle markdown code blocks)
-            response_clean = response.strip()
-            if response_clean.startswith('```'):
-                # Remove markdown code blocks
-                lines = response_clean.split('\n')
-                response_clean = '\n'.join(lines[1:-1] if len(lines) > 2 else lines)
+        Uses the provider's Batch API when the adapter has one (half the cost,
+        one submission instead of a request per photo, results within 24h);
+        otherwise falls back to abatch_analyze_photo_activity.
 
-            result = json.loads(response_clean)
+        Args:
+            photos_data: List of photo_data dicts (see analyze_photo_activity)
 
-            # Validate activity_type
-            valid_types = ['meal', 'nap', 'play', 'learning', 'outdoor', 'art', 'other']
-            if result.get('activity_type') not in valid_types:
-                result['activity_type'] = 'other'
+        Returns:
+            Analysis dicts in the same order as photos_data
+        """
+        if not hasattr(self.adapter, 'abatch_chat'):
+            return await self.abatch_analyze_photo_activity(photos_data)
 
-            return result
+        requests = []
+        for photo_data in photos_data:
+            request = self._photo_activity_request(photo_data)
+            request['messages'] = self._fill_child_name(request['messages'], request.pop('child_name'))
+            request.pop('cache_messages')
+            requests.append(request)
 
+        try:
+            responses = await self.adapter.abatch_chat(requests)
         except Exception as e:
-            print(f"Error analyzing photo activity: {e}")
-            # Return default classification based on time of day
-            default_mood = "happy"
-            default_type = "play"
-
-            if time_of_day:
-                hour = int(time_of_day.split(':')[0]) if ':' in time_of_day else 12
-                if 11 <= hour <= 13:
-                    default_type = "meal"
-                elif 13 <= hour <= 15:
-                    default_type = "nap"
-                    default_mood = "calm"
+            print(f"Error running batch photo analysis: {e}")
+            responses = [None] * len(photos_data)
 
-            return {
-                "activity_type": default_type,
-                "confidence": 0.5,
-                "mood": default_mood,
-                "suggested_duration": None
-            }
+        results = []
+        for photo_data, response in zip(photos_data, responses):
+            try:
+                results.append(self._parse_photo_activity(response))
+            except Exception as e:
+                print(f"Error analyzing photo activity: {e}")
+                results.append(self._default_photo_activity(photo_data.get('time_of_day', '')))
+
+        return results
+
+    def _photo_activity_request(self, photo_data: Dict[str, any]) -> Dict:
+        """
+        Build chat arguments for analyze_photo_activity
+
+        The classification does not depend on the child, so the cache key drops
+        the name and uses the time in 30-minute buckets plus the sorted objects;
+        photos from the same half hour with the same objects share one answer.
+        """
+        child_name = photo_data.get('child_name', 'the child')
+        time_of_day = photo_data.get('time_of_day', '')
+        detected_objects = photo_data.get('detected_objects', [])
+        canonical_objects = sorted({str(obj).strip().lower() for obj in detected_objects})
+
+        context_str = f"Time: {time_of_day}. " if time_of_day else ""
+        if detected_objects:
+            context_str += f"Visible: {', '.join(detected_objects)}"
+
+        user_prompt = f"""Analyze this daycare moment for {self.CHILD_SENTINEL}.
+{context_str}
+
+Provide JSON with activity_type, confidence, mood, and suggested_duration."""
+
+        return {
+            'messages': user_prompt,
+            'system_prompt': _SYS_ANALYZE,
+            'temperature': 0.3,  # Lower temperature for more consistent categorization
+            'child_name': child_name,
+            'response_schema': _ACTIVITY_ANALYSIS_SCHEMA,
+            'cache_messages': f"activity\x1e{self._time_bucket(time_of_day)}\x1e{','.join(canonical_objects)}"
+        }
+
+    @staticmethod
+    def _time_bucket(time_of_day: str) -> str:
+        """Round an HH:MM time down to its half hour (unparseable values are used as-is)"""
+        hour, _, minute = (time_of_day or '').strip().partition(':')
+        if not (hour.isdigit() and minute[:2].isdigit()):
+            return (time_of_day or '').strip()
+        return f"{int(hour):02d}:{'30' if int(minute[:2]) >= 30 else '00'}"
+
+    def _parse_photo_activity(self, response: str) -> Dict[str, any]:
+        """Parse the model's JSON answer for analyze_photo_activity"""
+        # JSON mode returns bare JSON; fences are still handled in case a
+        # provider/model ignores the response format
+        response_clean = response.strip()
+        if response_clean.startswith('```'):
+            # Drop the opening fence line (```json) and the closing fence by slicing
+            response_clean = response_clean[response_clean.find('\n') + 1:]
+            if response_clean.endswith('```'):
+                response_clean = response_clean[:-3]
+
+        result = json.loads(response_clean)
+
+        # Validate activity_type
+        valid_types = ['meal', 'nap', 'play', 'learning', 'outdoor', 'art', 'other']
+        if result.get('activity_type') not in valid_types:
+            result['activity_type'] = 'other'
+
+        return result
+
+    def _default_photo_activity(self, time_of_day: str) -> Dict[str, any]:
+        """Default classification based on time of day, used when the LLM call fails (flagged as fallback)"""
+        hour = 12
+        if time_of_day and ':' in time_of_day:
+            hour_text = time_of_day[:time_of_day.index(':')].strip()
+            if hour_text.isdigit() and int(hour_text) < 24:
+                hour = int(hour_text)
+
+        default_type, default_mood = _HOUR_TO_DEFAULT_ACTIVITY[hour] if time_of_day else ("play", "happy")
+
+        return {
+            "activity_type": default_type,
+            "confidence": 0.5,
+            "mood": default_mood,
+            "suggested_duration": None,
+            "fallback": True
+        }
 
     def generate_daily_summary(
         self,
@@ -206,6 +647,61 @@ Provide JSON with activity_type, confidence, mood, and suggested_duration."""
         Returns:
             Natural narrative summary of the day
         """
+        request = self._daily_summary_request(child_name, activities, photo_count)
+
+        try:
+            summary = self._chat(**request)
+            return summary.strip()
+        except Exception as e:
+            print(f"Error generating daily summary: {e}")
+            return self._daily_summary_fallback(child_name, photo_count)
+
+    def stream_daily_summary(self, child_name: str, activities: List[Dict], photo_count: int):
+        """
+        Stream the daily summary as it is generated
+
+        The first words reach the parent after the model's first token instead
+        of after the whole completion (e.g. render with st.write_stream).
+
+        Yields:
+            Text chunks of the summary
+        """
+        request = self._daily_summary_request(child_name, activities, photo_count)
+        request['messages'] = self._fill_child_name(request['messages'], request.pop('child_name'))
+
+        streamed = False
+        try:
+            self._rate_limiter.acquire_blocking(self._estimate_tokens(request['messages'], request['system_prompt']))
+            for chunk in self.adapter.stream_chat(**request):
+                streamed = True
+                yield chunk
+        except Exception as e:
+            print(f"Error streaming daily summary: {e}")
+            if not streamed:
+                yield self._daily_summary_fallback(child_name, photo_count)
+
+    async def astream_daily_summary(self, child_name: str, activities: List[Dict], photo_count: int):
+        """Async variant of stream_daily_summary"""
+        request = self._daily_summary_request(child_name, activities, photo_count)
+        request['messages'] = self._fill_child_name(request['messages'], request.pop('child_name'))
+
+        streamed = False
+        try:
+            await self._rate_limiter.acquire(self._estimate_tokens(request['messages'], request['system_prompt']))
+            async for chunk in self.adapter.astream_chat(**request):
+                streamed = True
+                yield chunk
+        except Exception as e:
+            print(f"Error streaming daily summary: {e}")
+            if not streamed:
+                yield self._daily_summary_fallback(child_name, photo_count)
+
+    def _daily_summary_fallback(self, child_name: str, photo_count: int) -> str:
+        """Summary used when the LLM call fails"""
+        return f"{child_name} had a wonderful day at daycare today! We captured {photo_count} special moments throughout the day."
+
+    def _daily_summary_request(self, child_name: str, activities: List[Dict], photo_count: int) -> Dict:
+        """Build chat arguments for generate_daily_summary"""
         # Build activity summary
         activity_summary = []
         for activity in activities[:10]:  # Limit to recent activities
@@ -216,12 +712,7 @@ Provide JSON with activity_type, confidence, mood, and suggested_duration."""
 
         activities_text = "\n".join(activity_summary) if activity_summary else "Various activities throughout the day"
 
-        system_prompt = """You are a caring daycare teacher writing a daily summary for parents.
-Write in a warm, personal tone as if you're talking directly to the parent.
-Keep it conversational and highlight the child's day in 2-3 sentences.
-Focus on positive moments and development."""
-
-        user_prompt = f"""Write a warm daily summary for {child_name}'s parent.
+        user_prompt = f"""Write a warm daily summary for {self.CHILD_SENTINEL}'s parent.
 
 Today's activities:
 {activities_text}
@@ -230,16 +721,12 @@ Photos captured: {photo_count}
 
 Write a brief, warm summary (2-3 sentences) that a parent would love to read."""
 
-        try:
-            summary = self.adapter.chat(
-                messages=user_prompt,
-                system_prompt=system_prompt,
-                temperature=0.8
-            )
-            return summary.strip()
-        except Exception as e:
-            print(f"Error generating daily summary: {e}")
-            return f"{child_name} had a wonderful day at daycare today! We captured {photo_count} special moments throughout the day."
+        return {
+            'messages': user_prompt,
+            'system_prompt': _SYS_SUMMARY,
+            'temperature': 0.8,
+            'child_name': child_name
+        }
 
     def enhance_activity_notes(
         self,
@@ -261,34 +748,59 @@ Write a brief, warm summary (2-3 sentences) that a parent would love to read."""
         if not basic_notes or len(basic_notes.strip()) < 5:
             return basic_notes
 
-        system_prompt = """You are a daycare teacher enhancing activity notes.
-Make them warmer and more detailed while keeping them concise.
-Maximum 1-2 sentences."""
-
-        user_prompt = f"""Enhance these {activity_type} notes for {child_name}:
-"{basic_notes}"
+        try:
+            enhanced = self._chat(**self._enhance_notes_request(activity_type, basic_notes, child_name))
+            return enhanced.strip()
+        except Exception as e:
+            print(f"Error enhancing notes: {e}")
+            return basic_notes
 
-Make it warmer and more descriptive (1-2 sentences)."""
+    async def aenhance_activity_notes(self, activity_type: str, basic_notes: str, child_name: str) -> str:
+        """Async variant of enhance_activity_notes"""
+        if not basic_notes or len(basic_notes.strip()) < 5:
+            return basic_notes
 
         try:
-            enhanced = self.adapter.chat(
-                messages=user_prompt,
-                system_prompt=system_prompt,
-                temperature=0.7
-            )
+            enhanced = await self._achat(**self._enhance_notes_request(activity_type, basic_notes, child_name))
             return enhanced.strip()
         except Exception as e:
             print(f"Error enhancing notes: {e}")
             return basic_notes
 
+    def _enhance_notes_request(self, activity_type: str, basic_notes: str, child_name: str) -> Dict:
+        """
+        Build chat arguments for enhance_activity_notes
+
+        Staff often paste the same short note ("Lunch", "Nap time ") across a
+        whole feed, so the cache is keyed on the activity type and the note
+        lowercased with whitespace collapsed; the child's name is filled in
+        by _chat as usual.
+        """
+        notes = " ".join(basic_notes.split())
+        user_prompt = f"""Enhance these {activity_type} notes for {self.CHILD_SENTINEL}:
+"{notes}"
+
+Make it warmer and more descriptive (1-2 sentences)."""
+
+        return {
+            'messages': user_prompt,
+            'system_prompt': _SYS_ENHANCE,
+            'temperature': 0.7,
+            'child_name': child_name,
+            'cache_messages': f"enhance\x1e{activity_type}\x1e{notes.lower()}"
+        }
+
 
 # Singleton instance
 _llm_service = None
+_llm_service_lock = threading.Lock()
 
 
 def get_llm_service() -> LLMService:
-    """Get LLM service singleton"""
+    """Get LLM service singleton (thread-safe)"""
     global _llm_service
     if _llm_service is None:
-        _llm_service = LLMService()
+        with _llm_service_lock:
+            if _llm_service is None:
+                _llm_service = LLMService()
     return _llm_service
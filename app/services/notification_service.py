@@ -4,6 +4,10 @@ Handles automated notifications for enrollment, daily updates, etc.
 """
 
 import os
+import html
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
 from dotenv import load_dotenv
 import smtplib
 from email.mime.text import MIMEText
@@ -11,49 +15,20 @@ from email.mime.multipart import MIMEMultipart
 
 load_dotenv()
 
-class NotificationService:
-    def __init__(self):
-        # Email configuration
-        self.email_host = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
-        self.email_port = int(os.getenv('EMAIL_PORT', 465))
-        self.email_user = os.getenv('EMAIL_HOST_USER')
-        self.email_password = os.getenv('EMAIL_HOST_PASSWORD')
-        self.email_from = os.getenv('EMAIL_FROM_ADDRESS', 'noreply@daycaremoments.com')
-
-        # Twilio configuration
-        self.twilio_enabled = os.getenv('TWILIO_ENABLED', 'true').lower() == 'true'
-        self.twilio_account_sid = os.getenv('TWILIO_ACCOUNT_SID')
-        self.twilio_auth_token = os.getenv('TWILIO_AUTH_TOKEN')
-        self.twilio_phone_number = os.getenv('TWILIO_PHONE_NUMBER')
-
-        self.twilio_client = None
-        if self.twilio_enabled and self.twilio_account_sid and self.twilio_auth_token:
-            try:
-                from twilio.rest import Client
-                self.twilio_client = Client(self.twilio_account_sid, self.twilio_auth_token)
-            except ImportError:
-                print("Twilio not installed. Install with: pip install twilio")
-            except Exception as e:
-                print(f"Twilio initialization error: {e}")
-
-    def send_enrollment_email(self, parent_email, parent_name, child_name, temp_password):
-        """Send enrollment welcome email to parent"""
-        try:
-            subject = f"Welcome to DaycareMoments - {child_name} Enrolled!"
-
-            html_body = f"""
+# Parsed once at import; values are HTML-escaped before substitution
+_ENROLLMENT_EMAIL_HTML = Template("""
             <html>
             <head>
                 <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                              color: white; padding: 30px; text-align: center; border-radius: 10px; }}
-                    .content {{ background: #f9f9f9; padding: 30px; margin-top: 20px; border-radius: 10px; }}
-                    .credentials {{ background: white; padding: 20px; border-left: 4px solid #667eea; margin: 20px 0; }}
-                    .button {{ display: inline-block; background: #667eea; color: white;
-                             padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-                    .footer {{ text-align: center; color: #999; margin-top: 30px; font-size: 12px; }}
+                    body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                    .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+                    .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                              color: white; padding: 30px; text-align: center; border-radius: 10px; }
+                    .content { background: #f9f9f9; padding: 30px; margin-top: 20px; border-radius: 10px; }
+                    .credentials { background: white; padding: 20px; border-left: 4px solid #667eea; margin: 20px 0; }
+                    .button { display: inline-block; background: #667eea; color: white;
+                             padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }
+                    .footer { text-align: center; color: #999; margin-top: 30px; font-size: 12px; }
                 </style>
             </head>
             <body>
@@ -64,9 +39,9 @@ class NotificationService:
                     </div>
 
                     <div class="content">
-                        <p>Dear {parent_name},</p>
+                        <p>Dear ${parent_name},</p>
 
-                        <p>Congratulations! <strong>{child_name}</strong> has been successfully enrolled in our daycare.</p>
+                        <p>Congratulations! <strong>${child_name}</strong> has been successfully enrolled in our daycare.</p>
 
                         <p>Your parent account has been created. You can now:</p>
                         <ul>
@@ -78,8 +53,8 @@ class NotificationService:
 
                         <div class="credentials">
                             <h3>🔐 Your Login Credentials</h3>
-                            <p><strong>Email:</strong> {parent_email}</p>
-                            <p><strong>Temporary Password:</strong> {temp_password}</p>
+                            <p><strong>Email:</strong> ${parent_email}</p>
+                            <p><strong>Temporary Password:</strong> ${temp_password}</p>
                             <p><em>⚠️ Please change your password after first login for security.</em></p>
                         </div>
 
@@ -92,7 +67,7 @@ class NotificationService:
                             <li>Start viewing your child's daily moments!</li>
                         </ol>
 
-                        <p>Our staff will begin uploading photos of {child_name}'s activities throughout the day.</p>
+                        <p>Our staff will begin uploading photos of ${child_name}'s activities throughout the day.</p>
 
                         <p>If you have any questions, please don't hesitate to contact us.</p>
 
@@ -107,7 +82,52 @@ class NotificationService:
                 </div>
             </body>
             </html>
-            """
+            """)
+
+class NotificationService:
+    def __init__(self):
+        # Email configuration
+        self.email_host = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
+        self.email_port = int(os.getenv('EMAIL_PORT', 465))
+        self.email_user = os.getenv('EMAIL_HOST_USER')
+        self.email_password = os.getenv('EMAIL_HOST_PASSWORD')
+        self.email_from = os.getenv('EMAIL_FROM_ADDRESS', 'noreply@daycaremoments.com')
+
+        # Logged-in SMTP connection kept open between emails (smtplib is not thread-safe)
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+
+        # Runs email / SMS / call concurrently for enrollment notifications
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='notify')
+        self.notification_timeout = 30
+
+        # Twilio configuration
+        self.twilio_enabled = os.getenv('TWILIO_ENABLED', 'true').lower() == 'true'
+        self.twilio_account_sid = os.getenv('TWILIO_ACCOUNT_SID')
+        self.twilio_auth_token = os.getenv('TWILIO_AUTH_TOKEN')
+        self.twilio_phone_number = os.getenv('TWILIO_PHONE_NUMBER')
+
+        self.twilio_client = None
+        if self.twilio_enabled and self.twilio_account_sid and self.twilio_auth_token:
+            try:
+                from twilio.rest import Client
+                self.twilio_client = Client(self.twilio_account_sid, self.twilio_auth_token)
+            except ImportError:
+                print("Twilio not installed. Install with: pip install twilio")
+            except Exception as e:
+                print(f"Twilio initialization error: {e}")
+
+    def send_enrollment_email(self, parent_email, parent_name, child_name, temp_password):
+        """Send enrollment welcome email to parent"""
+        try:
+            subject = f"Welcome to DaycareMoments - {child_name} Enrolled!"
+
+            html_body = _ENROLLMENT_EMAIL_HTML.substitute(
+                parent_name=html.escape(str(parent_name)),
+                child_name=html.escape(str(child_name)),
+                parent_email=html.escape(str(parent_email)),
+                temp_password=html.escape(str(temp_password))
+            )
 
             msg = MIMEMultipart('alternative')
             msg['Subject'] = subject
@@ -117,14 +137,49 @@ class NotificationService:
             html_part = MIMEText(html_body, 'html')
             msg.attach(html_part)
 
-            with smtplib.SMTP_SSL(self.email_host, self.email_port) as server:
-                server.login(self.email_user, self.email_password)
-                server.send_message(msg)
+            self._send_message(msg)
 
             return True, "Email sent successfully"
         except Exception as e:
             return False, f"Email error: {str(e)}"
 
+    def _send_message(self, msg):
+        """Send over the shared SMTP connection, reconnecting once if it was dropped"""
+        with self._smtp_lock:
+            try:
+                self._get_smtp().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                self._smtp = None
+                self._get_smtp().send_message(msg)
+
+    def _get_smtp(self):
+        """Return a live, logged-in SMTP connection (caller holds _smtp_lock)"""
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except (smtplib.SMTPException, OSError):
+                self._smtp = None
+
+        server = smtplib.SMTP_SSL(self.email_host, self.email_port)
+        try:
+            server.login(self.email_user, self.email_password)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        return server
+
+    def close(self):
+        """Close the shared SMTP connection"""
+        with self._smtp_lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._smtp = None
+
     def send_enrollment_sms(self, parent_phone, child_name, portal_url="http://localhost:8501"):
         """Send SMS notification to parent"""
         if not self.twilio_client:
@@ -197,30 +252,39 @@ Check your email for credentials.
             'call': {'sent': False, 'message': ''}
         }
 
-        # Send Email
-        email_success, email_msg = self.send_enrollment_email(
-            parent_email, parent_name, child_name, temp_password
-        )
-        results['email'] = {'sent': email_success, 'message': email_msg}
+        # Dispatch all channels at once; total time is the slowest provider, not the sum
+        futures = {
+            'email': self._executor.submit(
+                self.send_enrollment_email, parent_email, parent_name, child_name, temp_password
+            )
+        }
 
-        # Send SMS (if phone number provided)
+        # SMS and voice call only if phone number provided
         if parent_phone:
-            sms_success, sms_msg = self.send_enrollment_sms(parent_phone, child_name)
-            results['sms'] = {'sent': sms_success, 'message': sms_msg}
+            futures['sms'] = self._executor.submit(self.send_enrollment_sms, parent_phone, child_name)
+            futures['call'] = self._executor.submit(
+                self.make_enrollment_call, parent_phone, child_name, parent_name
+            )
 
-            # Make Voice Call (if phone number provided)
-            call_success, call_msg = self.make_enrollment_call(parent_phone, child_name, parent_name)
-            results['call'] = {'sent': call_success, 'message': call_msg}
+        for channel, future in futures.items():
+            try:
+                success, message = future.result(timeout=self.notification_timeout)
+            except Exception as e:
+                success, message = False, f"{channel.capitalize()} error: {str(e)}"
+            results[channel] = {'sent': success, 'message': message}
 
         return results
 
 
 # Singleton instance
 _notification_service = None
+_notification_service_lock = threading.Lock()
 
 def get_notification_service():
-    """Get singleton notification service instance"""
+    """Get singleton notification service instance (thread-safe)"""
     global _notification_service
     if _notification_service is None:
-        _notification_service = NotificationService()
+        with _notification_service_lock:
+            if _notification_service is None:
+                _notification_service = NotificationService()
     return _notification_service
@@ -9,7 +9,76 @@ Automatically analyzes photos to detect:
 
 from datetime import datetime
 from typing import Dict, List, Optional
+import asyncio
 import random
+import string
+import threading
+import zlib
+
+
+# Punctuation, digits and underscores become word breaks (e.g. "IMG_0412_lunch.jpg")
+_WORD_BREAKS = str.maketrans({ch: " " for ch in string.punctuation + string.digits})
+
+
+def _keyword_index(patterns: Dict[str, List[str]]) -> Dict[str, tuple]:
+    """
+    Invert a category -> keywords table into keyword -> (rank, category)
+
+    A keyword listed under several categories maps to the earliest one.
+    Simple plurals ("snacks", "books") are indexed alongside each keyword.
+    """
+    index = {}
+    for rank, (category, keywords) in enumerate(patterns.items()):
+        for keyword in keywords:
+            index.setdefault(keyword, (rank, category))
+            index.setdefault(f"{keyword}s", (rank, category))
+    return index
+
+
+def _first_category(index: Dict[str, tuple], text: str) -> Optional[str]:
+    """Return the earliest-listed category with a keyword among text's words"""
+    hits = set(text.lower().translate(_WORD_BREAKS).split()) & index.keys()
+    if not hits:
+        return None
+    return min(index[word] for word in hits)[1]
+
+
+_DEFAULT_MOODS = ("😊 Happy", "🙂 Good", "🤩 Excited", "😌 Calm")
+
+_ACTIVITY_DESCRIPTIONS = {
+    "meal": (
+        "Enjoying a nutritious meal",
+        "Having lunch with friends",
+        "Eating healthy snacks"
+    ),
+    "nap": (
+        "Resting peacefully",
+        "Taking a refreshing nap",
+        "Sleeping soundly"
+    ),
+    "play": (
+        "Playing with toys",
+        "Having fun with friends",
+        "Engaged in active play"
+    ),
+    "learning": (
+        "Learning new things",
+        "Engaged in educational activities",
+        "Exploring and discovering"
+    ),
+    "outdoor": (
+        "Enjoying outdoor activities",
+        "Playing in the fresh air",
+        "Exploring nature"
+    ),
+    "art": (
+        "Creating beautiful artwork",
+        "Expressing creativity",
+        "Making crafts"
+    )
+}
+
+_FALLBACK_DESCRIPTIONS = ("Having a great time",)
 
 
 class PhotoAnalysisService:
@@ -32,6 +101,10 @@ class PhotoAnalysisService:
         "tired": ["sleepy", "yawning", "drowsy"]
     }
 
+    # Keyword -> category lookups built once; a text is matched by word-set intersection
+    _ACTIVITY_INDEX = _keyword_index(ACTIVITY_PATTERNS)
+    _MOOD_INDEX = _keyword_index(MOOD_DETECTION)
+
     def __init__(self, llm_service=None):
         """Initialize with optional LLM service for advanced analysis"""
         self.llm_service = llm_service
@@ -46,6 +119,9 @@ class PhotoAnalysisService:
         - Caption/description
 
         In production: Use OpenAI Vision API, Google Cloud Vision, or AWS Rekognition
+
+        Keyword-based only and never calls the LLM (same for batch_analyze_photos);
+        use aanalyze_photo / abatch_analyze_photos for model-refined results.
         """
 
         # Extract filename and metadata
@@ -57,7 +133,7 @@ class PhotoAnalysisService:
         detected_activity = self._detect_activity_from_text(caption + " " + filename)
 
         # Detect mood (in production: use facial emotion recognition)
-        detected_mood = self._detect_mood_from_text(caption)
+        detected_mood = self._detect_mood_from_text(caption, photo_metadata.get('id') or photo_url)
 
         # Generate smart description
         description = self._generate_description(detected_activity, detected_mood, timestamp)
@@ -72,64 +148,25 @@ class PhotoAnalysisService:
 
     def _detect_activity_from_text(self, text: str) -> str:
         """Detect activity type from text (caption/filename)"""
-        text_lower = text.lower()
-
-        for activity, keywords in self.ACTIVITY_PATTERNS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return activity
+        activity = _first_category(self._ACTIVITY_INDEX, text)
 
         # Default to "play" if nothing detected
-        return "play"
+        return activity or "play"
 
-    def _detect_mood_from_text(self, text: str) -> str:
-        """Detect mood from text"""
-        text_lower = text.lower()
+    def _detect_mood_from_text(self, text: str, photo_key: str = '') -> str:
+        """Detect mood from text, falling back to a default chosen by photo_key (photo id/URL)"""
+        mood = _first_category(self._MOOD_INDEX, text)
+        if mood:
+            return f"😊 {mood.capitalize()}"
 
-        for mood, keywords in self.MOOD_DETECTION.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return f"😊 {mood.capitalize()}"
-
-        # Default moods
-        moods = ["😊 Happy", "🙂 Good", "🤩 Excited", "😌 Calm"]
-        return random.choice(moods)
+        # Default mood: picked from a CRC of the photo key (str hash() is salted per
+        # process), so a photo keeps its mood across restarts and workers without a
+        # list allocation or shared random-state lock on this path
+        return _DEFAULT_MOODS[zlib.crc32(str(photo_key or text).encode()) % len(_DEFAULT_MOODS)]
 
     def _generate_description(self, activity: str, mood: str, timestamp: datetime) -> str:
         """Generate natural language description"""
-
-        descriptions = {
-            "meal": [
-                "Enjoying a nutritious meal",
-                "Having lunch with friends",
-                "Eating healthy snacks"
-            ],
-            "nap": [
-                "Resting peacefully",
-                "Taking a refreshing nap",
-                "Sleeping soundly"
-            ],
-            "play": [
-                "Playing with toys",
-                "Having fun with friends",
-                "Engaged in active play"
-            ],
-            "learning": [
-                "Learning new things",
-                "Engaged in educational activities",
-                "Exploring and discovering"
-            ],
-            "outdoor": [
-                "Enjoying outdoor activities",
-                "Playing in the fresh air",
-                "Exploring nature"
-            ],
-            "art": [
-                "Creating beautiful artwork",
-                "Expressing creativity",
-                "Making crafts"
-            ]
-        }
-
-        return random.choice(descriptions.get(activity, ["Having a great time"]))
+        return random.choice(_ACTIVITY_DESCRIPTIONS.get(activity, _FALLBACK_DESCRIPTIONS))
 
     def detect_faces(self, photo_url: str) -> List[Dict]:
         """
@@ -205,6 +242,99 @@ class PhotoAnalysisService:
 
         return results
 
+    async def aanalyze_photo(self, photo_url: str, photo_metadata: Dict) -> Dict:
+        """
+        Async variant of analyze_photo
+
+        When an LLM service is configured, the keyword-based activity guess is
+        refined by the model without blocking the event loop. Unlike the sync
+        analyze_photo, this may therefore return the model's classification.
+        """
+        analysis = self.analyze_photo(photo_url, photo_metadata)
+
+        if not self.llm_service:
+            return analysis
+
+        llm_result = await self.llm_service.aanalyze_photo_activity(
+            self._llm_photo_data(analysis, photo_metadata)
+        )
+        return self._merge_llm_result(analysis, llm_result)
+
+    def _llm_photo_data(self, analysis: Dict, photo_metadata: Dict) -> Dict:
+        """Build the LLM service's photo_data from a keyword analysis and photo metadata"""
+        timestamp = analysis['timestamp']
+        caption = photo_metadata.get('caption', '')
+        return {
+            'child_name': photo_metadata.get('child_name', 'the child'),
+            'time_of_day': timestamp.strftime('%H:%M') if isinstance(timestamp, datetime) else '',
+            'detected_objects': [caption] if caption else []
+        }
+
+    def _merge_llm_result(self, analysis: Dict, llm_result: Optional[Dict]) -> Dict:
+        """
+        Let the LLM's classification override the keyword guess
+
+        Fallback results (the model was unreachable and the service guessed from
+        the time of day) are weaker than the keyword match, so they are ignored.
+        """
+        if not llm_result or llm_result.get('fallback'):
+            return analysis
+        analysis['activity_type'] = llm_result.get('activity_type', analysis['activity_type'])
+        analysis['confidence'] = llm_result.get('confidence', analysis['confidence'])
+        return analysis
+
+    async def abatch_analyze_photos(self, photos: List[Dict], max_concurrency: int = 10) -> List[Dict]:
+        """
+        Analyze multiple photos concurrently
+
+        LLM round trips overlap, so a batch costs roughly one request's latency
+        instead of one per photo. max_concurrency keeps within provider rate limits.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def analyze(photo: Dict) -> Dict:
+            async with semaphore:
+                return await self.aanalyze_photo(photo['url'], photo)
+
+        analyses = await asyncio.gather(*(analyze(photo) for photo in photos), return_exceptions=True)
+
+        results = []
+        for photo, analysis in zip(photos, analyses):
+            if isinstance(analysis, Exception):
+                print(f"Error analyzing photo {photo.get('url')}: {analysis}")
+                analysis = self.analyze_photo(photo['url'], photo)
+            results.append({
+                **photo,
+                "analysis": analysis
+            })
+
+        return results
+
+    async def abatch_analyze_photos_via_batch_api(self, photos: List[Dict]) -> List[Dict]:
+        """
+        Analyze a day's photos with a single provider batch job
+
+        Half the cost of per-photo calls but results can take hours, so use it
+        for background end-of-day work (e.g. before generate_daily_story), not
+        the live upload path. Photos the job returned no answer for (failed or
+        expired batch) keep their keyword classification.
+        """
+        if not self.llm_service:
+            return await self.abatch_analyze_photos(photos)
+
+        analyses = [self.analyze_photo(photo['url'], photo) for photo in photos]
+        llm_results = await self.llm_service.abatch_analyze_photo_activity_offline([
+            self._llm_photo_data(analysis, photo) for analysis, photo in zip(analyses, photos)
+        ])
+
+        return [
+            {
+                **photo,
+                "analysis": self._merge_llm_result(analysis, llm_result)
+            }
+            for photo, analysis, llm_result in zip(photos, analyses, llm_results)
+        ]
+
     def generate_daily_story(self, analyzed_photos: List[Dict]) -> str:
         """
         Generate a natural language daily story from analyzed photos
@@ -214,11 +344,8 @@ class PhotoAnalysisService:
         if not analyzed_photos:
             return "No activities recorded today."
 
-        # Sort by timestamp
-        sorted_photos = sorted(analyzed_photos, key=lambda x: x.get('captured_at', datetime.now()))
-
-        # Group by activity
-        activities = [p['analysis']['activity_type'] for p in sorted_photos]
+        # Only which activities happened matters here, not their order
+        activities = {p['analysis']['activity_type'] for p in analyzed_photos}
 
         story_parts = []
         story_parts.append("Today was a great day!")
@@ -241,10 +368,13 @@ class PhotoAnalysisService:
 
 # Singleton instance
 _photo_analysis_service = None
+_photo_analysis_service_lock = threading.Lock()
 
 def get_photo_analysis_service():
-    """Get photo analysis service instance"""
+    """Get photo analysis service instance (thread-safe)"""
     global _photo_analysis_service
     if _photo_analysis_service is None:
-        _photo_analysis_service = PhotoAnalysisService()
+        with _photo_analysis_service_lock:
+            if _photo_analysis_service is None:
+                _photo_analysis_service = PhotoAnalysisService()
     return _photo_analysis_service
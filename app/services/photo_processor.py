@@ -3,9 +3,14 @@ Photo Processing Service - Automated photo processing with face recognition and
 Processes uploaded photos, detects faces, matches persons, and generates AI descriptions
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from sqlalchemy import update
+
+from app.config import Config
 from app.database import get_db
 from app.database.models import Photo, Person
 from app.services.face_recognition_service import get_face_recognition_service
@@ -18,12 +23,16 @@ class PhotoProcessor:
     def __init__(self):
         self.face_service = get_face_recognition_service()
         self.llm_service = get_llm_service()
+        # Description generation and DB writes are I/O-bound, so batch photos overlap
+        self._executor = ThreadPoolExecutor(max_workers=Config.PHOTO_WORKERS, thread_name_prefix='photo')
 
     def process_uploaded_photo(
         self,
         photo_id: str,
         image_data: bytes,
-        uploader_id: str
+        uploader_id: str,
+        faces: Optional[List[Dict[str, any]]] = None,
+        person_names: Optional[Dict[str, str]] = None
     ) -> Dict[str, any]:
         """
         Process a single uploaded photo with face detection, recognition, and AI analysis
@@ -32,6 +41,10 @@ class PhotoProcessor:
             photo_id: Photo ID in database
             image_data: Raw image bytes
             uploader_id: User ID of uploader (staff)
+            faces: Precomputed face_service.analyze_photo result (from process_batch);
+                detected here when omitted
+            person_names: Prefetched person_id -> name map (from process_batch);
+                looked up here when the primary person is missing from it
 
         Returns:
             Processing result dictionary with:
@@ -41,6 +54,50 @@ class PhotoProcessor:
                 - description: str
                 - error: str (if any)
         """
+        result, updates = self._process_photo(photo_id, image_data, faces, person_names)
+        if updates is None:
+            return result
+
+        try:
+            # Save all changes in one statement (get_db commits on exit)
+            with get_db() as db:
+                db.execute(update(Photo).where(Photo.id == photo_id).values(**updates))
+            result["success"] = True
+        except Exception as e:
+            result["error"] = str(e)
+            print(f"Error saving photo {photo_id}: {e}")
+
+        return result
+
+    def _process_photo(
+        self,
+        photo_id: str,
+        image_data: bytes,
+        faces: Optional[List[Dict[str, any]]] = None,
+        person_names: Optional[Dict[str, str]] = None,
+        organization_id: Optional[str] = None,
+        duplicate: Optional[tuple] = None
+    ):
+        """
+        Analyze and describe one photo without writing it
+
+        A photo whose content hash matches a processed photo in the same
+        organization reuses that photo's results and skips face analysis and
+        the LLM.
+
+        Args:
+            photo_id: Photo ID in database
+            image_data: Raw image bytes
+            faces: Precomputed face analysis (see process_uploaded_photo)
+            person_names: Prefetched person_id -> name map
+            organization_id: Photo's organization when already known (process_batch
+                then also supplies duplicate); looked up otherwise
+            duplicate: (person_id, ai_description) of an already processed copy
+
+        Returns:
+            Tuple of (result dict as returned by process_uploaded_photo with success
+            still False, Photo column updates); updates is None if processing failed
+        """
         result = {
             "success": False,
             "faces_detected": 0,
@@ -50,84 +107,88 @@ class PhotoProcessor:
         }
 
         try:
-            with get_db() as db:
-                # Get photo record
-                photo = db.query(Photo).filter(Photo.id == photo_id).first()
-                if not photo:
-                    result["error"] = "Photo not found"
-                    return result
-
-                # Step 1: Detect all faces in the image
-                face_locations = self.face_service.get_face_locations(image_data)
-                result["faces_detected"] = len(face_locations)
-
-                # Step 2: Identify persons in the photo
-                identified_person_ids = self.face_service.identify_persons_in_photo(
-                    image_data,
-                    photo.organization_id
-                )
-                result["persons_identified"] = identified_person_ids
-
-                # Step 3: If persons identified, process and generate description
-                if identified_person_ids:
-                    # Use first identified person as primary
-                    primary_person_id = identified_person_ids[0]
-                    photo.person_id = primary_person_id
-
-                    # Get person details for context
-                    person = db.query(Person).filter(Person.id == primary_person_id).first()
-                    person_name = person.name if person else "the child"
-
-                    # Prepare context for AI analysis
-                    photo_context = {
-                        "child_name": person_name,
-                        "time_of_day": datetime.now().strftime("%H:%M"),
-                        "location": None,
-                        "detected_objects": []
-                    }
-
-                    # Generate natural description
-                    description = self.llm_service.generate_activity_description(photo_context)
-                    photo.ai_description = description
-                    result["description"] = description
+            # Only the organization is needed up front; the row itself is written with one
+            # UPDATE afterwards, and no session is held during face analysis or the LLM call
+            if organization_id is None:
+                with get_db() as db:
+                    row = db.query(Photo.organization_id, Photo.content_hash).filter(Photo.id == photo_id).first()
+                    if row is None:
+                        result["error"] = "Photo not found"
+                        return result, None
+                    organization_id = row.organization_id
+                    duplicate = self._find_processed_duplicates(db, {photo_id: row}).get(photo_id)
+
+            if duplicate is not None:
+                person_id, description = duplicate
+                result["persons_identified"] = [person_id] if person_id else []
+                result["description"] = description
+                return result, {"person_id": person_id, "ai_description": description}
+
+            # Step 1 & 2: Detect and identify all faces in a single pass
+            if faces is None:
+                faces = self.face_service.analyze_photo(image_data, organization_id)
+            result["faces_detected"] = len(faces)
+
+            # Unique identified persons in first-seen order
+            identified_person_ids = list(dict.fromkeys(face["person_id"] for face in faces if face["person_id"]))
+            result["persons_identified"] = identified_person_ids
+
+            # Step 3: Name the primary (first identified) person for the description
+            updates = {}
+            person_name = "the children"
+            if identified_person_ids:
+                primary_person_id = identified_person_ids[0]
+                updates["person_id"] = primary_person_id
+
+                # Get person details for context
+                if person_names and primary_person_id in person_names:
+                    person_name = person_names[primary_person_id]
                 else:
-                    # No persons identified - still generate generic description
-                    photo_context = {
-                        "child_name": "the children",
-                        "time_of_day": datetime.now().strftime("%H:%M"),
-                        "location": None,
-                        "detected_objects": []
-                    }
-                    description = self.llm_service.generate_activity_description(photo_context)
-                    photo.ai_description = description
-                    result["description"] = description
-
-                # Commit all changes
-                db.commit()
-                result["success"] = True
+                    with get_db() as db:
+                        person_name = db.query(Person.name).filter(Person.id == primary_person_id).scalar()
+                    person_name = person_name or "the child"
 
-                return result
+            # Generate natural description (generic when nobody was identified)
+            photo_context = {
+                "child_name": person_name,
+                "time_of_day": datetime.now().strftime("%H:%M"),
+                "location": None,
+                "detected_objects": []
+            }
+            description = self.llm_service.generate_activity_description(photo_context)
+            updates["ai_description"] = description
+            result["description"] = description
+
+            return result, updates
 
         except Exception as e:
             result["error"] = str(e)
             print(f"Error processing photo {photo_id}: {e}")
             import traceback
             traceback.print_exc()
-            return result
+            return result, None
 
     def process_batch(
         self,
         photo_ids: List[str],
         image_data_map: Dict[str, bytes],
-        uploader_id: str
+        uploader_id: str,
+        batch_size: int = 32
     ) -> Dict[str, any]:
         """
         Process multiple photos in batch
 
+        Face detection and recognition run up front, batch_size photos at a
+        time per organization, so each photo afterwards only needs its
+        description. Those run concurrently on the processor's thread pool
+        (Config.PHOTO_WORKERS), and the resulting row updates are written
+        Config.PHOTO_COMMIT_BATCH photos per transaction.
+
         Args:
             photo_ids: List of photo IDs to process
             image_data_map: Dictionary mapping photo_id to image bytes
             uploader_id: User ID of uploader
+            batch_size: Photos sent to the face encoder per call
 
         Returns:
             Batch processing summary
@@ -141,18 +202,47 @@ class PhotoProcessor:
             "results": []
         }
 
+        photo_rows, duplicates = self._load_batch_photos(photo_ids, image_data_map)
+        organization_ids = {photo_id: row.organization_id for photo_id, row in photo_rows.items()}
+        faces_by_photo = self._analyze_faces_batch(
+            {photo_id: org for photo_id, org in organization_ids.items() if photo_id not in duplicates},
+            image_data_map,
+            batch_size
+        )
+        person_names = self._load_person_names(faces_by_photo)
+
+        futures = {}
         for photo_id in photo_ids:
             image_data = image_data_map.get(photo_id)
             if not image_data:
                 summary["failed"] += 1
                 continue
 
-            result = self.process_uploaded_photo(photo_id, image_data, uploader_id)
-            summary["results"].append({
-                "photo_id": photo_id,
-                "result": result
-            })
+            future = self._executor.submit(
+                self._process_photo,
+                photo_id, image_data,
+                faces=faces_by_photo.get(photo_id),
+                person_names=person_names,
+                organization_id=organization_ids.get(photo_id),
+                duplicate=duplicates.get(photo_id)
+            )
+            futures[future] = photo_id
+
+        results = {}
+        pending = []
+        for future in as_completed(futures):
+            photo_id = futures[future]
+            result, updates = future.result()
+            results[photo_id] = result
 
+            if updates is not None:
+                pending.append((photo_id, updates, result))
+                if len(pending) >= Config.PHOTO_COMMIT_BATCH:
+                    self._save_photo_updates(pending)
+                    pending = []
+        self._save_photo_updates(pending)
+
+        for result in results.values():
             if result["success"]:
                 summary["successful"] += 1
                 summary["faces_detected"] += result["faces_detected"]
@@ -160,19 +250,170 @@ class PhotoProcessor:
             else:
                 summary["failed"] += 1
 
+        # Keep results in submission order
+        summary["results"] = [
+            {"photo_id": photo_id, "result": results[photo_id]}
+            for photo_id in photo_ids
+            if photo_id in results
+        ]
+
         # Convert set to list for JSON serialization
         summary["persons_identified"] = list(summary["persons_identified"])
 
         return summary
 
+    def _load_batch_photos(self, photo_ids: List[str], image_data_map: Dict[str, bytes]):
+        """
+        Load the batch's photo rows and any already processed copies in two queries
+
+        Returns:
+            Tuple of (photo_id -> (organization_id, content_hash) row, photo_id -> duplicate
+            as accepted by _process_photo); photos missing from the first are
+            looked up individually by _process_photo
+        """
+        ids = [photo_id for photo_id in photo_ids if image_data_map.get(photo_id)]
+        if not ids:
+            return {}, {}
+
+        try:
+            with get_db() as db:
+                rows = db.query(Photo.id, Photo.organization_id, Photo.content_hash).filter(Photo.id.in_(ids)).all()
+                photo_rows = {row.id: row for row in rows}
+                return photo_rows, self._find_processed_duplicates(db, photo_rows)
+        except Exception as e:
+            print(f"Error loading photos for batch processing: {e}")
+            return {}, {}
+
+    def _find_processed_duplicates(self, db, photo_rows: Dict[str, any]) -> Dict[str, tuple]:
+        """
+        Find processed photos with the same image content as the given ones
+
+        Photos without a content hash are never treated as duplicates: URLs
+        (placeholders, S3/Drive keys) say nothing about the image itself.
+
+        Args:
+            db: Open session
+            photo_rows: photo_id -> row with organization_id and content_hash
+
+        Returns:
+            Dictionary mapping photo_id to (person_id, ai_description) of a processed copy
+            in the same organization
+        """
+        hashes = {row.content_hash for row in photo_rows.values() if row.content_hash}
+        if not hashes:
+            return {}
+
+        copies = db.query(Photo.content_hash, Photo.organization_id, Photo.person_id, Photo.ai_description).filter(
+            Photo.content_hash.in_(list(hashes)),
+            Photo.id.notin_(list(photo_rows)),
+            Photo.ai_description.isnot(None)
+        ).all()
+        processed = {
+            (copy.content_hash, copy.organization_id): (copy.person_id, copy.ai_description)
+            for copy in copies
+        }
+
+        duplicates = {}
+        for photo_id, row in photo_rows.items():
+            if not row.content_hash:
+                continue
+            copy = processed.get((row.content_hash, row.organization_id))
+            if copy is not None:
+                duplicates[photo_id] = copy
+        return duplicates
+
+    def _analyze_faces_batch(
+        self,
+        organization_ids: Dict[str, str],
+        image_data_map: Dict[str, bytes],
+        batch_size: int
+    ) -> Dict[str, List[Dict[str, any]]]:
+        """
+        Run face analysis for a batch of photos, grouped by organization
+
+        Args:
+            organization_ids: photo_id -> organization_id for the photos to analyze
+            image_data_map: Dictionary mapping photo_id to image bytes
+            batch_size: Photos sent to the face encoder per call
+
+        Returns:
+            Dictionary mapping photo_id to its analyze_photo result
+        """
+        photos_by_org = {}
+        for photo_id, organization_id in organization_ids.items():
+            photos_by_org.setdefault(organization_id, []).append(photo_id)
+
+        faces_by_photo = {}
+        for organization_id, org_photo_ids in photos_by_org.items():
+            results = self.face_service.analyze_photos(
+                [image_data_map[photo_id] for photo_id in org_photo_ids],
+                organization_id,
+                batch_size=batch_size
+            )
+            faces_by_photo.update(zip(org_photo_ids, results))
+
+        return faces_by_photo
+
+    def _save_photo_updates(self, pending: list):
+        """
+        Write processed photos' column updates in one transaction
+
+        Args:
+            pending: List of (photo_id, updates, result) tuples; each result is
+                marked successful once its row is saved
+        """
+        if not pending:
+            return
+
+        try:
+            # ORM bulk UPDATE by primary key (executemany, grouped by column set)
+            with get_db() as db:
+                db.execute(update(Photo), [{"id": photo_id, **updates} for photo_id, updates, _ in pending])
+            for _, _, result in pending:
+                result["success"] = True
+            return
+        except Exception as e:
+            print(f"Batch photo update failed, saving photos individually: {e}")
+
+        for photo_id, updates, result in pending:
+            try:
+                with get_db() as db:
+                    db.execute(update(Photo).where(Photo.id == photo_id).values(**updates))
+                result["success"] = True
+            except Exception as e:
+                result["error"] = str(e)
+                print(f"Error saving photo {photo_id}: {e}")
+
+    def _load_person_names(self, faces_by_photo: Dict[str, List[Dict[str, any]]]) -> Dict[str, str]:
+        """Fetch names for every person identified in a batch with a single IN query"""
+        person_ids = {
+            face["person_id"]
+            for faces in faces_by_photo.values()
+            for face in faces
+            if face["person_id"]
+        }
+        if not person_ids:
+            return {}
+
+        try:
+            with get_db() as db:
+                rows = db.query(Person.id, Person.name).filter(Person.id.in_(person_ids)).all()
+            return {person_id: name for person_id, name in rows}
+        except Exception as e:
+            print(f"Error loading person names for batch: {e}")
+            return {}
+
 
 # Singleton instance
 _photo_processor = None
+_photo_processor_lock = threading.Lock()
 
 
 def get_photo_processor() -> PhotoProcessor:
-    """Get photo processor singleton"""
+    """Get photo processor singleton (thread-safe)"""
     global _photo_processor
     if _photo_processor is None:
-        _photo_processor = PhotoProcessor()
+        with _photo_processor_lock:
+            if _photo_processor is None:
+                _photo_processor = PhotoProcessor()
     return _photo_processor
@@ -1,6 +1,44 @@
 """Storage Service - Swappable storage backends"""
 
+import hashlib
+import threading
+from pathlib import Path
+
 from app.config import Config
+from app.database import get_db
+from app.database.models import Photo
+
+
+def content_hash(file_data: bytes) -> str:
+    """
+    Digest identifying a file's content (stored as Photo.content_hash)
+
+    Args:
+        file_data: File bytes
+
+    Returns:
+        64-character hex blake2b-256 digest
+    """
+    return hashlib.blake2b(file_data, digest_size=32).hexdigest()
+
+
+def content_address(file_data: bytes, file_name: str, folder: str = "photos") -> str:
+    """
+    Storage key derived from the file's content
+
+    Identical uploads map to the same key, so they are stored once. Several
+    Photo rows can therefore point at one stored file.
+
+    Args:
+        file_data: File bytes
+        file_name: Original file name (only its extension is kept)
+        folder: Folder/prefix for organization
+
+    Returns:
+        Key of the form '{folder}/{hash[:2]}/{hash}{ext}'
+    """
+    digest = content_hash(file_data)
+    return f"{folder}/{digest[:2]}/{digest}{Path(file_name).suffix.lower()}"
 
 
 class StorageService:
@@ -24,6 +62,14 @@ class StorageService:
 
         self.storage_type = storage_type
 
+        # Bind the adapter's methods directly so each storage call skips the forwarders below;
+        # the class methods stay as the documented interface
+        self.upload = self.adapter.upload
+        self.download = self.adapter.download
+        self.delete = self.adapter.delete
+        self.list_files = self.adapter.list_files
+        self.get_url = self.adapter.get_url
+
     def upload(self, file_data: bytes, file_name: str, folder: str = "photos") -> str:
         """
         Upload file to storage
@@ -62,6 +108,34 @@ class StorageService:
         """
         return self.adapter.delete(file_path)
 
+    def delete_photo_file(self, file_path: str, content_hash: str = None) -> bool:
+        """
+        Delete a photo's stored file unless another photo still uses it
+
+        Uploads are content-addressed, so photos with identical bytes share one
+        stored file. Call after deleting the Photo row: the file is removed only
+        once no remaining Photo has the same content_hash.
+
+        Args:
+            file_path: Path or URL the upload returned
+            content_hash: The deleted photo's Photo.content_hash; read from the
+                content-addressed file name when omitted
+
+        Returns:
+            True if the file was deleted or is still in use
+        """
+        if not content_hash:
+            stem = Path(file_path).stem
+            if len(stem) == 64 and all(ch in '0123456789abcdef' for ch in stem):
+                content_hash = stem
+
+        if content_hash:
+            with get_db() as db:
+                if db.query(Photo.id).filter(Photo.content_hash == content_hash).first() is not None:
+                    return True
+
+        return self.adapter.delete(file_path)
+
     def list_files(self, folder: str = "photos") -> list:
         """
         List files in a folder
@@ -89,11 +163,14 @@ class StorageService:
 
 # Singleton instance
 _storage_service = None
+_storage_service_lock = threading.Lock()
 
 
 def get_storage_service():
-    """Get storage service singleton"""
+    """Get storage service singleton (thread-safe)"""
     global _storage_service
     if _storage_service is None:
-        _storage_service = StorageService()
+        with _storage_service_lock:
+            if _storage_service is None:
+                _storage_service = StorageService()
     return _storage_service
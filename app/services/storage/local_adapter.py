@@ -3,7 +3,7 @@
 import os
 from pathlib import Path
 from app.config import Config
-import uuid
+from app.services.storage import content_address
 
 
 class LocalAdapter:
@@ -14,32 +14,39 @@ class LocalAdapter:
         self.base_path.mkdir(parents=True, exist_ok=True)
 
     def upload(self, file_data: bytes, file_name: str, folder: str = "photos") -> str:
-        """Upload file to local storage"""
-        # Create folder if not exists
-        folder_path = self.base_path / folder
-        folder_path.mkdir(parents=True, exist_ok=True)
+        """Upload file to local storage (content-addressed: identical files are stored once)"""
+        relative_path = content_address(file_data, file_name, folder)
+        file_path = self.base_path / relative_path
 
-        # Generate unique filename
-        file_ext = Path(file_name).suffix
-        unique_name = f"{uuid.uuid4()}{file_ext}"
-        file_path = folder_path / unique_name
+        # Same content already stored
+        if file_path.exists() and file_path.stat().st_size == len(file_data):
+            return relative_path
 
-        # Write file
-        with open(file_path, 'wb') as f:
-            f.write(file_data)
+        # Create folder if not exists
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write file straight to the descriptor (no stdio buffer copy); os.write may be partial
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(file_data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
 
         # Return relative path
-        return str(file_path.relative_to(self.base_path))
+        return relative_path
 
     def download(self, file_path: str) -> bytes:
         """Download file from local storage"""
         full_path = self.base_path / file_path
 
-        with open(full_path, 'rb') as f:
+        # Unbuffered read sizes the result from fstat and fills it in one pass
+        with open(full_path, 'rb', buffering=0) as f:
             return f.read()
 
     def delete(self, file_path: str) -> bool:
-        """Delete file from local storage"""
+        """Delete file from local storage (use StorageService.delete_photo_file for photos)"""
         try:
             full_path = self.base_path / file_path
             full_path.unlink()
@@ -1,7 +1,7 @@
 """Cloudflare R2 Storage Adapter (S3-compatible)"""
 
 from app.config import Config
-import uuid
+from app.services.storage import content_address
 
 
 class R2Adapter:
@@ -10,6 +10,7 @@ class R2Adapter:
     def __init__(self):
         # In production, initialize boto3 client for R2
         # import boto3
+        # from boto3.s3.transfer import TransferConfig
         #
         # self.client = boto3.client(
         #     's3',
@@ -20,31 +21,39 @@ class R2Adapter:
         # )
         # self.bucket_name = Config.R2_BUCKET_NAME
         # self.public_url = Config.R2_PUBLIC_URL
+        # # Multipart above 5MB, parts sent over parallel connections
+        # self.transfer_config = TransferConfig(
+        #     multipart_threshold=5 * 1024 * 1024,
+        #     max_concurrency=8,
+        #     use_threads=True
+        # )
 
         print("R2 adapter initialized (demo mode)")
 
     def upload(self, file_data: bytes, file_name: str, folder: str = "photos") -> str:
-        """Upload file to R2"""
+        """Upload file to R2 (content-addressed: identical files share one object)"""
+        key = content_address(file_data, file_name, folder)
+
         # In production:
-        # key = f"{folder}/{uuid.uuid4()}_{file_name}"
-        # self.client.put_object(
-        #     Bucket=self.bucket_name,
-        #     Key=key,
-        #     Body=file_data,
-        #     ContentType='image/jpeg'
+        # self.client.upload_fileobj(
+        #     io.BytesIO(file_data),
+        #     self.bucket_name,
+        #     key,
+        #     Config=self.transfer_config,
+        #     ExtraArgs={'ContentType': 'image/jpeg'}
         # )
         # return f"{self.public_url}/{key}"
 
         # Demo mode
-        file_id = str(uuid.uuid4())
-        return f"https://pub-{file_id}.r2.dev/{folder}/{file_name}"
+        return f"https://pub-demo.r2.dev/{key}"
 
     def download(self, file_path: str) -> bytes:
         """Download file from R2"""
         # In production:
         # key = extract_key_from_url(file_path)
-        # response = self.client.get_object(Bucket=self.bucket_name, Key=key)
-        # return response['Body'].read()
+        # buffer = io.BytesIO()
+        # self.client.download_fileobj(self.bucket_name, key, buffer, Config=self.transfer_config)
+        # return buffer.getvalue()
 
         return b""  # Demo mode
 
@@ -60,11 +69,12 @@ class R2Adapter:
     def list_files(self, folder: str = "photos") -> list:
         """List files in folder"""
         # In production:
-        # response = self.client.list_objects_v2(
+        # # list_objects_v2 returns at most 1000 keys per call; the paginator follows continuation tokens
+        # pages = self.client.get_paginator('list_objects_v2').paginate(
         #     Bucket=self.bucket_name,
         #     Prefix=folder
         # )
-        # return [f"{self.public_url}/{obj['Key']}" for obj in response.get('Contents', [])]
+        # return [f"{self.public_url}/{obj['Key']}" for page in pages for obj in page.get('Contents', [])]
 
         return []  # Demo mode
 
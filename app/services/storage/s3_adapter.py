@@ -1,7 +1,7 @@
 """AWS S3 Storage Adapter"""
 
 from app.config import Config
-import uuid
+from app.services.storage import content_address
 
 
 class S3Adapter:
@@ -10,6 +10,7 @@ class S3Adapter:
     def __init__(self):
         # In production, initialize boto3 client
         # import boto3
+        # from boto3.s3.transfer import TransferConfig
         #
         # self.client = boto3.client(
         #     's3',
@@ -18,32 +19,39 @@ class S3Adapter:
         #     region_name=Config.AWS_REGION
         # )
         # self.bucket_name = Config.S3_BUCKET_NAME
+        # # Multipart above 5MB, parts sent over parallel connections
+        # self.transfer_config = TransferConfig(
+        #     multipart_threshold=5 * 1024 * 1024,
+        #     max_concurrency=8,
+        #     use_threads=True
+        # )
 
         print("S3 adapter initialized (demo mode)")
 
     def upload(self, file_data: bytes, file_name: str, folder: str = "photos") -> str:
-        """Upload file to S3"""
+        """Upload file to S3 (content-addressed: identical files share one object)"""
+        key = content_address(file_data, file_name, folder)
+
         # In production:
-        # key = f"{folder}/{uuid.uuid4()}_{file_name}"
-        # self.client.put_object(
-        #     Bucket=self.bucket_name,
-        #     Key=key,
-        #     Body=file_data,
-        #     ContentType='image/jpeg',
-        #     ACL='public-read'
+        # self.client.upload_fileobj(
+        #     io.BytesIO(file_data),
+        #     self.bucket_name,
+        #     key,
+        #     Config=self.transfer_config,
+        #     ExtraArgs={'ContentType': 'image/jpeg', 'ACL': 'public-read'}
         # )
         # return f"https://{self.bucket_name}.s3.amazonaws.com/{key}"
 
         # Demo mode
-        file_id = str(uuid.uuid4())
-        return f"https://daycare-photos.s3.amazonaws.com/{folder}/{file_id}_{file_name}"
+        return f"https://daycare-photos.s3.amazonaws.com/{key}"
 
     def download(self, file_path: str) -> bytes:
         """Download file from S3"""
         # In production:
         # key = extract_key_from_url(file_path)
-        # response = self.client.get_object(Bucket=self.bucket_name, Key=key)
-        # return response['Body'].read()
+        # buffer = io.BytesIO()
+        # self.client.download_fileobj(self.bucket_name, key, buffer, Config=self.transfer_config)
+        # return buffer.getvalue()
 
         return b""  # Demo mode
 
@@ -59,13 +67,15 @@ class S3Adapter:
     def list_files(self, folder: str = "photos") -> list:
         """List files in folder"""
         # In production:
-        # response = self.client.list_objects_v2(
+        # # list_objects_v2 returns at most 1000 keys per call; the paginator follows continuation tokens
+        # pages = self.client.get_paginator('list_objects_v2').paginate(
         #     Bucket=self.bucket_name,
         #     Prefix=folder
         # )
         # return [
         #     f"https://{self.bucket_name}.s3.amazonaws.com/{obj['Key']}"
-        #     for obj in response.get('Contents', [])
+        #     for page in pages
+        #     for obj in page.get('Contents', [])
         # ]
 
         return []  # Demo mode
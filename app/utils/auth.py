@@ -1,35 +1,128 @@
 """Authentication utilities"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
 import bcrypt
 import streamlit as st
+from sqlalchemy import bindparam, select
+from app.config import Config
 from app.database import get_db
 from app.database.models import User
 
+# Each Streamlit session already runs on its own thread and bcrypt releases the GIL,
+# so hashes from different sessions run in parallel; cap them at one per core so a
+# burst of logins doesn't oversubscribe the CPU and slow every session down
+_bcrypt_slots = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+BCRYPT_HASH_LENGTH = 60
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# Recently verified logins, so repeat sign-ins skip the DB lookup and bcrypt.
+# Keyed by an HMAC of email + password under a per-process random key (plaintext
+# passwords are never stored); entries live AUTH_CACHE_TTL seconds.
+AUTH_CACHE_SIZE = 1024
+AUTH_CACHE_TTL = 60
+_auth_cache_key = os.urandom(32)
+_auth_cache: OrderedDict = OrderedDict()  # hmac digest -> (user dict, expires_at), least recently used first
+_auth_cache_lock = threading.Lock()
+# Bumped by every invalidation, so a login verified against a hash that changed
+# meanwhile (password change, deletion) is not cached afterwards
+_auth_cache_generation = 0
+
+# Login lookup as a Core statement built once: returns a plain row of the columns
+# we need instead of hydrating a full User into the session identity map
+_USER_AUTH_STMT = select(
+    User.id, User.email, User.role, User.organization_id, User.password_hash
+).where(User.email == bindparam("email"))
+
 
 def hash_password(password: str) -> str:
-    """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    """Hash password using bcrypt at the configured cost (Config.BCRYPT_ROUNDS)"""
+    salt = bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)
+    with _bcrypt_slots:
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def calibrate_bcrypt_rounds(max_ms: float = 150, min_rounds: int = 10, max_rounds: int = 14):
+    """
+    Find the highest bcrypt cost that hashes within a time budget on this machine
+
+    Existing hashes keep verifying after BCRYPT_ROUNDS changes (the cost is
+    stored in each hash); only new and re-hashed passwords use the new cost.
+
+    Args:
+        max_ms: Time budget per hash in milliseconds
+        min_rounds: Lowest cost considered (returned even if it exceeds the budget)
+        max_rounds: Highest cost considered
+
+    Returns:
+        Tuple of (suggested BCRYPT_ROUNDS value, dict of rounds -> measured ms)
+    """
+    best = min_rounds
+    timings = {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        salt = bcrypt.gensalt(rounds=rounds)
+        start = time.perf_counter()
+        bcrypt.hashpw(b'calibration-password', salt)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        timings[rounds] = elapsed_ms
+        if elapsed_ms > max_ms:
+            break
+        best = rounds
+    return best, timings
 
 
 def verify_password(password: str, hashed: str) -> bool:
     """Verify password against hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    # Stored value that isn't a bcrypt hash can never match; reject it without running bcrypt
+    if not hashed or len(hashed) != BCRYPT_HASH_LENGTH or hashed[:4] not in BCRYPT_PREFIXES:
+        return False
+
+    with _bcrypt_slots:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
 
 def authenticate_user(email: str, password: str):
     """Authenticate user with email and password - returns dict to avoid session issues"""
+    cache_key = hmac.new(_auth_cache_key, f"{email}\x00{password}".encode('utf-8'), hashlib.sha256).digest()
+    with _auth_cache_lock:
+        entry = _auth_cache.get(cache_key)
+        if entry is not None and entry[1] > time.monotonic():
+            _auth_cache.move_to_end(cache_key)
+            return dict(entry[0])
+        generation = _auth_cache_generation
+
     with get_db() as db:
-        user = db.query(User).filter(User.email == email).first()
-        if user and verify_password(password, user.password_hash):
-            # Return dict to avoid detached instance errors
-            return {
-                'id': user.id,
-                'email': user.email,
-                'role': user.role,
-                'organization_id': user.organization_id
+        row = db.execute(_USER_AUTH_STMT, {"email": email}).first()
+        if row and verify_password(password, row.password_hash):
+            user_dict = {
+                'id': row.id,
+                'email': row.email,
+                'role': row.role,
+                'organization_id': row.organization_id
             }
+            with _auth_cache_lock:
+                if generation == _auth_cache_generation:
+                    _auth_cache[cache_key] = (user_dict, time.monotonic() + AUTH_CACHE_TTL)
+                    _auth_cache.move_to_end(cache_key)
+                    while len(_auth_cache) > AUTH_CACHE_SIZE:
+                        _auth_cache.popitem(last=False)
+            return dict(user_dict)
     return None
 
 
+def invalidate_cached_logins(email: str):
+    """Forget cached logins for a user (call on logout, deletion or password change)"""
+    global _auth_cache_generation
+    with _auth_cache_lock:
+        _auth_cache_generation += 1
+        for cache_key in [key for key, (user, _) in _auth_cache.items() if user['email'] == email]:
+            del _auth_cache[cache_key]
+
+
 def register_user(email: str, password: str, role: str, organization_id: str):
     """Register new user - returns dict to avoid session issues"""
     with get_db() as db:
@@ -61,33 +154,97 @@ def register_user(email: str, password: str, role: str, organization_id: str):
         return user_dict, None
 
 
-def get_current_user():
-    """Get current logged-in user from session"""
-    if 'user_id' in st.session_state:
+def change_password(email: str, new_password: str) -> bool:
+    """
+    Set a user's password and forget their cached logins
+
+    Args:
+        email: User's email
+        new_password: New plaintext password
+
+    Returns:
+        True if the user exists
+    """
+    with get_db() as db:
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            return False
+        user.password_hash = hash_password(new_password)
+
+    invalidate_cached_logins(email)
+    return True
+
+
+def delete_user(user_id: str) -> bool:
+    """
+    Delete a user and forget their cached logins
+
+    Args:
+        user_id: ID of the user to delete
+
+    Returns:
+        True if the user existed
+    """
+    with get_db() as db:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return False
+        email = user.email
+        db.delete(user)
+
+    invalidate_cached_logins(email)
+    return True
+
+
+def _session_user_snapshot():
+    """
+    Copy session state into a plain dict with a single session_state call
+
+    Returns:
+        Dict of session state values (no user_id key when logged out)
+    """
+    return st.session_state.to_dict()
+
+
+def get_current_user(snapshot=None):
+    """Get current logged-in user from session
+
+    Args:
+        snapshot: Optional result of _session_user_snapshot() to reuse
+
+    Returns:
+        User dict, or None when not logged in
+    """
+    snap = _session_user_snapshot() if snapshot is None else snapshot
+    if 'user_id' in snap:
         return {
-            'id': st.session_state.get('user_id'),
-            'email': st.session_state.get('email'),
-            'role': st.session_state.get('role'),
-            'organization_id': st.session_state.get('organization_id')
+            'id': snap.get('user_id'),
+            'email': snap.get('email'),
+            'role': snap.get('role'),
+            'organization_id': snap.get('organization_id')
         }
     return None
 
 
 def require_auth(allowed_roles=None):
     """Require authentication"""
-    if 'user_id' not in st.session_state:
+    snap = _session_user_snapshot()
+    if 'user_id' not in snap:
         st.error("⛔ Please login to access this page")
         st.stop()
 
-    if allowed_roles and st.session_state.get('role') not in allowed_roles:
+    if allowed_roles and snap.get('role') not in allowed_roles:
         st.error(f"⛔ This page requires {', '.join(allowed_roles)} role")
         st.stop()
 
-    return get_current_user()
+    return get_current_user(snap)
 
 
 def logout():
     """Logout current user"""
+    if st.session_state.get('email'):
+        invalidate_cached_logins(st.session_state['email'])
+
     for key in list(st.session_state.keys()):
         del st.session_state[key]
     st.rerun()
@@ -1,14 +1,31 @@
 """Professional UI Theme for DaycareMoments Application"""
 
+import re
+
 import streamlit as st
 
-def apply_professional_theme():
-    """Apply professional purple gradient theme with modern UI elements and mobile responsiveness"""
-    st.markdown("""
+def _minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    css = css.replace(" !important", "!important")
+    return css.replace(";}", "}").strip()
+
+
+# Theme stylesheet, minified once at import; Streamlit drops elements a rerun doesn't
+# re-emit, so it is sent on every run and its size matters
+_THEME_CSS = _minify_css("""
     <style>
+        /* ===== BRAND GRADIENTS (used throughout) ===== */
+        :root {
+            --dm-gradient: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            --dm-gradient-reverse: linear-gradient(135deg, #764ba2 0%, #667eea 100%);
+        }
+
         /* ===== MAIN BACKGROUND ===== */
         .main {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+            background: var(--dm-gradient) !important;
             padding: 1rem !important;
         }
 
@@ -76,7 +93,7 @@ def apply_professional_theme():
 
         /* ===== BUTTONS ===== */
         .stButton > button {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+            background: var(--dm-gradient) !important;
             color: white !important;
             border: none !important;
             border-radius: 25px !important;
@@ -92,7 +109,7 @@ def apply_professional_theme():
         .stButton > button:hover {
             transform: translateY(-3px) !important;
             box-shadow: 0 8px 25px rgba(102, 126, 234, 0.6) !important;
-            background: linear-gradient(135deg, #764ba2 0%, #667eea 100%) !important;
+            background: var(--dm-gradient-reverse) !important;
         }
 
         .stButton > button:active {
@@ -138,7 +155,7 @@ def apply_professional_theme():
         }
 
         h1 {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            background: var(--dm-gradient);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
             background-clip: text;
@@ -177,7 +194,7 @@ def apply_professional_theme():
         }
 
         .stTabs [aria-selected="true"] {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+            background: var(--dm-gradient) !important;
             color: white !important;
         }
 
@@ -185,7 +202,7 @@ def apply_professional_theme():
         [data-testid="stMetricValue"] {
             font-size: 2.5rem !important;
             font-weight: 700 !important;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            background: var(--dm-gradient);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
             background-clip: text;
@@ -209,7 +226,7 @@ def apply_professional_theme():
         }
 
         .dataframe thead tr th {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+            background: var(--dm-gradient) !important;
             color: white !important;
             font-weight: 600 !important;
             padding: 15px !important;
@@ -255,7 +272,7 @@ def apply_professional_theme():
         }
 
         .stInfo {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+            background: var(--dm-gradient) !important;
             color: white !important;
             border-radius: 15px !important;
             padding: 15px !important;
@@ -280,7 +297,7 @@ def apply_professional_theme():
         }
 
         .stChatMessage[data-testid*="user"] {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+            background: var(--dm-gradient) !important;
             color: white !important;
             border-left: 6px solid #fff !important;
         }
@@ -306,7 +323,7 @@ def apply_professional_theme():
 
         /* ===== PROGRESS BAR ===== */
         .stProgress > div > div {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+            background: var(--dm-gradient) !important;
             border-radius: 10px !important;
         }
 
@@ -362,7 +379,7 @@ def apply_professional_theme():
         }
 
         table thead {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+            background: var(--dm-gradient) !important;
             color: white !important;
         }
 
@@ -382,12 +399,12 @@ def apply_professional_theme():
         }
 
         ::-webkit-scrollbar-thumb {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            background: var(--dm-gradient);
             border-radius: 10px;
         }
 
         ::-webkit-scrollbar-thumb:hover {
-            background: linear-gradient(135deg, #764ba2 0%, #667eea 100%);
+            background: var(--dm-gradient-reverse);
         }
 
         /* ===== ANIMATION FOR PAGE LOAD ===== */
@@ -406,7 +423,12 @@ def apply_professional_theme():
             animation: fadeIn 0.5s ease-in-out;
         }
     </style>
-    """, unsafe_allow_html=True)
+""")
+
+
+def apply_professional_theme():
+    """Apply professional purple gradient theme with modern UI elements and mobile responsiveness"""
+    st.markdown(_THEME_CSS, unsafe_allow_html=True)
 
 
 def create_metric_card(label, value, delta=None, delta_color="normal"):
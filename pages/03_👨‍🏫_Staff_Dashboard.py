@@ -4,8 +4,9 @@ import streamlit as st
 from app.utils.auth import require_auth, get_current_user
 from app.database import get_db
 from app.database.models import Person, Photo
+from app.services.storage import content_hash
 from datetime import datetime, timedelta
-from sqlalchemy import desc
+from sqlalchemy import desc, func, case
 import uuid
 from io import BytesIO
 from PIL import Image
@@ -97,6 +98,7 @@ with tab1:
                                 encoding = face_service.encode_face(photo.read())
                                 if encoding is not None:
                                     face_encodings.append(encoding.tolist())
+                            face_encodings = face_service.prune_encodings(face_encodings)
                         except Exception as e:
                             st.warning(f"Face recognition setup: {str(e)}")
 
@@ -112,6 +114,10 @@ with tab1:
                         db.add(child)
                         db.commit()
 
+                    # Recognize the new child right away instead of after the encoding cache expires
+                    from app.services.face_recognition_service import get_face_recognition_service
+                    get_face_recognition_service().invalidate_known_encodings(user['organization_id'])
+
                     st.success(f"✅ Child '{child_name}' enrolled successfully!")
                     st.success(f"✅ Parent account created: {parent_email} (Password: temppass123)")
                     st.info(f"📸 {len(face_encodings)} face recognition photos processed")
@@ -299,6 +305,7 @@ with tab3:
                             photo = Photo(
                                 id=str(uuid.uuid4()),
                                 url=photo_url,
+                                content_hash=content_hash(image_data),
                                 person_id=person_id,
                                 ai_description=ai_description,
                                 uploaded_by=user['id'],
@@ -348,6 +355,7 @@ with tab4:
                                     encoding = face_service.encode_face(photo.read())
                                     if encoding is not None:
                                         face_encodings.append(encoding.tolist())
+                                face_encodings = face_service.prune_encodings(face_encodings)
 
                                 if len(face_encodings) >= 3:
                                     st.success(f"✅ Processed {len(face_encodings)} training photos")
@@ -367,6 +375,9 @@ with tab4:
                             db.add(person)
                             db.commit()
 
+                        from app.services.face_recognition_service import get_face_recognition_service
+                        get_face_recognition_service().invalidate_known_encodings(user['organization_id'])
+
                         st.success(f"✅ Person '{person_name}' added successfully!")
                         st.rerun()
 
@@ -403,11 +414,11 @@ with tab4:
                     # Photo stats
                     with get_db() as db:
                         week_ago = datetime.now() - timedelta(days=7)
-                        total_photos = db.query(Photo).filter(Photo.person_id == person['id']).count()
-                        week_photos = db.query(Photo).filter(
-                            Photo.person_id == person['id'],
-                            Photo.uploaded_at >= week_ago
-                        ).count()
+                        photo_stats = db.query(
+                            func.count(Photo.id),
+                            func.sum(case((Photo.uploaded_at >= week_ago, 1), else_=0))
+                        ).filter(Photo.person_id == person['id']).one()
+                        total_photos, week_photos = (count or 0 for count in photo_stats)
 
                     st.metric("Total Photos", total_photos)
                     st.metric("Photos This Week", week_photos)
@@ -419,6 +430,10 @@ with tab4:
                         if person_to_delete:
                             db.delete(person_to_delete)
                             db.commit()
+
+                    # Stop matching the deleted person's encodings
+                    from app.services.face_recognition_service import get_face_recognition_service
+                    get_face_recognition_service().invalidate_known_encodings(user['organization_id'])
                     st.success(f"✅ Deleted {person['name']}")
                     st.rerun()
     else:
@@ -431,18 +446,15 @@ with tab5:
     with get_db() as db:
         # Get stats
         total_persons = db.query(Person).filter(Person.organization_id == user['organization_id']).count()
-        total_photos = db.query(Photo).filter(Photo.organization_id == user['organization_id']).count()
 
+        # All photo counts in one pass over the organization's photos
         week_ago = datetime.now() - timedelta(days=7)
-        week_photos = db.query(Photo).filter(
-            Photo.organization_id == user['organization_id'],
-            Photo.uploaded_at >= week_ago
-        ).count()
-
-        ai_described = db.query(Photo).filter(
-            Photo.organization_id == user['organization_id'],
-            Photo.ai_description.isnot(None)
-        ).count()
+        photo_stats = db.query(
+            func.count(Photo.id),
+            func.sum(case((Photo.uploaded_at >= week_ago, 1), else_=0)),
+            func.sum(case((Photo.ai_description.isnot(None), 1), else_=0))
+        ).filter(Photo.organization_id == user['organization_id']).one()
+        total_photos, week_photos, ai_described = (count or 0 for count in photo_stats)
 
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -1,11 +1,11 @@
 """Admin Panel - Manage users and organization settings"""
 
 import streamlit as st
-from app.utils.auth import require_auth, get_current_user, register_user
+from app.utils.auth import require_auth, get_current_user, register_user, delete_user
 from app.database import get_db
 from app.database.models import User, Person, Photo, Organization
 from datetime import datetime, timedelta
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, case
 import uuid
 
 st.set_page_config(page_title="Admin Panel", page_icon="⚙️", layout="wide")
@@ -94,11 +94,7 @@ with tab1:
                 # Delete button (can't delete self)
                 if usr['id'] != user['id']:
                     if st.button(f"🗑️ Delete {usr['email']}", key=f"delete_user_{usr['id']}"):
-                        with get_db() as db:
-                            user_to_delete = db.query(User).filter(User.id == usr['id']).first()
-                            if user_to_delete:
-                                db.delete(user_to_delete)
-                                db.commit()
+                        delete_user(usr['id'])
                         st.success(f"✅ Deleted {usr['email']}")
                         st.rerun()
                 else:
@@ -112,37 +108,28 @@ with tab2:
 
     with get_db() as db:
         # Get stats
-        total_users = db.query(User).filter(User.organization_id == user['organization_id']).count()
         total_persons = db.query(Person).filter(Person.organization_id == user['organization_id']).count()
-        total_photos = db.query(Photo).filter(Photo.organization_id == user['organization_id']).count()
-
-        # Role breakdown
-        staff_count = db.query(User).filter(
-            User.organization_id == user['organization_id'],
-            User.role == 'staff'
-        ).count()
-
-        parent_count = db.query(User).filter(
-            User.organization_id == user['organization_id'],
-            User.role == 'parent'
-        ).count()
-
-        admin_count = db.query(User).filter(
-            User.organization_id == user['organization_id'],
-            User.role == 'admin'
-        ).count()
 
-        # Recent activity
+        # Role breakdown (one grouped query; total is the sum)
+        role_counts = dict(
+            db.query(User.role, func.count(User.id))
+            .filter(User.organization_id == user['organization_id'])
+            .group_by(User.role)
+            .all()
+        )
+        total_users = sum(role_counts.values())
+        staff_count = role_counts.get('staff', 0)
+        parent_count = role_counts.get('parent', 0)
+        admin_count = role_counts.get('admin', 0)
+
+        # Photo totals and recent activity in one pass
         week_ago = datetime.now() - timedelta(days=7)
-        week_photos = db.query(Photo).filter(
-            Photo.organization_id == user['organization_id'],
-            Photo.uploaded_at >= week_ago
-        ).count()
-
-        ai_described = db.query(Photo).filter(
-            Photo.organization_id == user['organization_id'],
-            Photo.ai_description.isnot(None)
-        ).count()
+        photo_stats = db.query(
+            func.count(Photo.id),
+            func.sum(case((Photo.uploaded_at >= week_ago, 1), else_=0)),
+            func.sum(case((Photo.ai_description.isnot(None), 1), else_=0))
+        ).filter(Photo.organization_id == user['organization_id']).one()
+        total_photos, week_photos, ai_described = (count or 0 for count in photo_stats)
 
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
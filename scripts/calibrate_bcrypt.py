@@ -0,0 +1,26 @@
+"""
+Suggest a BCRYPT_ROUNDS value for this machine
+
+Run from the repository root on the production host:
+
+    python -m scripts.calibrate_bcrypt [--max-ms 150]
+"""
+
+import argparse
+
+from app.utils.auth import calibrate_bcrypt_rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-ms", type=float, default=150, help="Time budget per hash in milliseconds")
+    args = parser.parse_args()
+
+    rounds, timings = calibrate_bcrypt_rounds(max_ms=args.max_ms)
+    for cost, elapsed_ms in timings.items():
+        print(f"bcrypt rounds={cost}: {elapsed_ms:.0f} ms")
+    print(f"Suggested: BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
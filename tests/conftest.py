@@ -0,0 +1,29 @@
+"""Shared fixtures: a throwaway SQLite database per test"""
+
+import pytest
+
+from app.config import Config
+from app.database import connection
+from app.database.models import Organization
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Point get_db() at an empty SQLite file (demo seeding skipped)"""
+    monkeypatch.setattr(Config, "DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr("app.database.seed.seed_demo_data", lambda: None)
+    engine = connection.init_db()
+    yield engine
+    engine.dispose()
+    connection._engine = None
+    connection._SessionLocal = None
+
+
+@pytest.fixture
+def organization(database):
+    """ID of an organization in the test database"""
+    with connection.get_db() as db:
+        org = Organization(name="Test Daycare", email="test@daycare.com")
+        db.add(org)
+        db.flush()
+        return org.id
@@ -0,0 +1,138 @@
+"""Tests for authentication helpers"""
+
+import pytest
+
+from app.config import Config
+from app.utils import auth
+
+
+class FakeSessionState:
+    """Stands in for st.session_state, counting proxy reads"""
+
+    def __init__(self, values):
+        self.values = values
+        self.reads = 0
+
+    def to_dict(self):
+        self.reads += 1
+        return dict(self.values)
+
+
+def test_require_auth_reads_session_state_once(monkeypatch):
+    state = FakeSessionState({
+        'user_id': 'u1',
+        'email': 'staff@demo.com',
+        'role': 'staff',
+        'organization_id': 'org1'
+    })
+    monkeypatch.setattr(auth.st, "session_state", state)
+
+    user = auth.require_auth(['staff', 'admin'])
+
+    assert user == {'id': 'u1', 'email': 'staff@demo.com', 'role': 'staff', 'organization_id': 'org1'}
+    assert state.reads == 1
+
+
+def test_get_current_user_is_none_when_logged_out(monkeypatch):
+    monkeypatch.setattr(auth.st, "session_state", FakeSessionState({}))
+
+    assert auth.get_current_user() is None
+
+
+@pytest.fixture
+def user(database, organization, monkeypatch):
+    """Registered user (cheap bcrypt cost) with an empty login cache"""
+    monkeypatch.setattr(Config, "BCRYPT_ROUNDS", 4)
+    monkeypatch.setattr(auth, "_auth_cache", auth.OrderedDict())
+    created, error = auth.register_user("staff@test.com", "secret", "staff", organization)
+    assert error is None
+    return created
+
+
+@pytest.fixture
+def bcrypt_checks(monkeypatch):
+    """Count password verifications that reach bcrypt"""
+    calls = []
+    verify_password = auth.verify_password
+
+    def counting_verify(password, hashed):
+        calls.append(password)
+        return verify_password(password, hashed)
+
+    monkeypatch.setattr(auth, "verify_password", counting_verify)
+    return calls
+
+
+def test_repeat_login_is_served_from_cache(user, bcrypt_checks):
+    assert auth.authenticate_user("staff@test.com", "secret") == user
+    assert auth.authenticate_user("staff@test.com", "secret") == user
+    assert bcrypt_checks == ["secret"]
+
+
+def test_failed_logins_are_not_cached(user, bcrypt_checks):
+    assert auth.authenticate_user("staff@test.com", "wrong") is None
+    assert auth.authenticate_user("staff@test.com", "wrong") is None
+    assert bcrypt_checks == ["wrong", "wrong"]
+
+
+def test_password_change_invalidates_cached_login(user):
+    assert auth.authenticate_user("staff@test.com", "secret")
+
+    assert auth.change_password("staff@test.com", "new-secret")
+
+    assert auth.authenticate_user("staff@test.com", "secret") is None
+    assert auth.authenticate_user("staff@test.com", "new-secret") == user
+
+
+def test_deleted_user_cannot_log_in_from_cache(user):
+    assert auth.authenticate_user("staff@test.com", "secret")
+
+    assert auth.delete_user(user['id'])
+
+    assert auth.authenticate_user("staff@test.com", "secret") is None
+
+
+def test_login_verified_during_invalidation_is_not_cached(user, monkeypatch):
+    verify_password = auth.verify_password
+
+    def verify_then_change(password, hashed):
+        # Password changes while this login is checking the old hash
+        auth.invalidate_cached_logins("staff@test.com")
+        return verify_password(password, hashed)
+
+    monkeypatch.setattr(auth, "verify_password", verify_then_change)
+    assert auth.authenticate_user("staff@test.com", "secret")
+
+    assert len(auth._auth_cache) == 0
+
+
+@pytest.mark.parametrize("stored", [
+    "",
+    "password123",
+    "$2b$12$tooshort",
+    "$argon2id$v=19$m=65536,t=3,p=4$c2FsdHNhbHRzYWx0$aGFzaGhhc2hoYXNoaGFzaGhhc2hoYXNoaGFzaA",
+    "$1$" + "x" * 57,
+])
+def test_non_bcrypt_stored_hashes_are_rejected_without_bcrypt(stored, monkeypatch):
+    def fail_checkpw(password, hashed):
+        raise AssertionError("bcrypt should not run")
+
+    monkeypatch.setattr(auth.bcrypt, "checkpw", fail_checkpw)
+
+    assert auth.verify_password("password123", stored) is False
+
+
+def test_bcrypt_hashes_still_verify(monkeypatch):
+    monkeypatch.setattr(Config, "BCRYPT_ROUNDS", 4)
+    hashed = auth.hash_password("password123")
+
+    assert auth.verify_password("password123", hashed)
+    assert not auth.verify_password("wrong", hashed)
+
+
+def test_calibration_returns_timings_without_printing(capsys):
+    rounds, timings = auth.calibrate_bcrypt_rounds(max_ms=10_000, min_rounds=4, max_rounds=5)
+
+    assert rounds == 5
+    assert list(timings) == [4, 5]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,20 @@
+"""Tests for database initialization"""
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.database.connection import _add_missing_columns
+
+
+def test_missing_nullable_columns_are_added_to_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE photos (id VARCHAR PRIMARY KEY, url VARCHAR NOT NULL, person_id VARCHAR, "
+            "ai_description TEXT, uploaded_by VARCHAR, organization_id VARCHAR NOT NULL, uploaded_at DATETIME)"
+        ))
+
+    _add_missing_columns(engine)
+
+    inspector = inspect(engine)
+    assert "content_hash" in {column["name"] for column in inspector.get_columns("photos")}
+    assert "ix_photos_content_hash" in {index["name"] for index in inspector.get_indexes("photos")}
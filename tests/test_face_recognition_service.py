@@ -0,0 +1,163 @@
+"""Tests for the face recognition service"""
+
+import numpy as np
+import pytest
+
+from app.database import get_db
+from app.database.models import Person
+from app.services import face_recognition_service
+from app.services.face_recognition_service import FaceRecognitionService
+
+
+class FakeRect:
+    """Minimal dlib.rectangle"""
+
+    def __init__(self, left, top, right, bottom):
+        self.coords = (left, top, right, bottom)
+
+    def left(self):
+        return self.coords[0]
+
+    def top(self):
+        return self.coords[1]
+
+    def right(self):
+        return self.coords[2]
+
+    def bottom(self):
+        return self.coords[3]
+
+
+class FakeDlib:
+    rectangle = FakeRect
+
+
+@pytest.fixture
+def service():
+    return FaceRecognitionService()
+
+
+def test_detection_is_full_size_by_default(service):
+    assert service.detection_max_side == 0
+
+
+def test_downscaled_detections_are_rescaled_to_original_image(service, monkeypatch):
+    monkeypatch.setattr(face_recognition_service, "dlib", FakeDlib, raising=False)
+    seen_shapes = []
+
+    def detector(image, upsample_times):
+        seen_shapes.append(image.shape)
+        return [FakeRect(10, 20, 60, 70)]
+
+    service.model = "hog"
+    service._detector = detector
+    service.detection_max_side = 500
+
+    rects = service._detect_faces(np.zeros((1000, 2000, 3), dtype=np.uint8))
+
+    assert seen_shapes == [(250, 500, 3)]
+    assert [rect.coords for rect in rects] == [(40, 80, 240, 280)]
+
+
+def test_small_images_are_detected_at_full_size(service):
+    seen_shapes = []
+
+    def detector(image, upsample_times):
+        seen_shapes.append(image.shape)
+        return [FakeRect(10, 20, 60, 70)]
+
+    service.model = "hog"
+    service._detector = detector
+    service.detection_max_side = 500
+
+    rects = service._detect_faces(np.zeros((300, 400, 3), dtype=np.uint8))
+
+    assert seen_shapes == [(300, 400, 3)]
+    assert [rect.coords for rect in rects] == [(10, 20, 60, 70)]
+
+
+def test_prune_drops_near_duplicate_encodings(service):
+    base = np.zeros(128)
+    other = np.full(128, 0.1)
+
+    pruned = service.prune_encodings([base.tolist(), (base + 0.001).tolist(), other.tolist()])
+
+    assert pruned == [base.tolist(), other.tolist()]
+
+
+def test_prune_caps_encodings_and_keeps_them_spread_out(service):
+    # Ten encodings spaced one unit apart along a line
+    encodings = [(np.eye(128)[0] * step).tolist() for step in range(10)]
+
+    pruned = service.prune_encodings(encodings)
+
+    assert len(pruned) == service.max_encodings_per_person
+    positions = sorted(encoding[0] for encoding in pruned)
+    assert positions[0] == 0 and positions[-1] == 9
+    assert min(np.diff(positions)) >= 2
+
+
+def test_prune_of_nothing_is_empty(service):
+    assert service.prune_encodings([]) == []
+
+
+def baseline_match(service, encodings, known_encodings, person_ids):
+    """Original float64 per-face distance matching"""
+    matches = []
+    for encoding in encodings:
+        distances = np.linalg.norm(np.asarray(known_encodings, dtype=np.float64) - encoding, axis=1)
+        best = int(np.argmin(distances))
+        matches.append(person_ids[best] if distances[best] <= service.tolerance else None)
+    return matches
+
+
+def test_float32_matching_agrees_with_float64_baseline(service):
+    rng = np.random.default_rng(0)
+    known_encodings = rng.normal(0, 0.1, size=(200, 128))
+    person_ids = [f"person-{index // 4}" for index in range(200)]
+    matrix = known_encodings.astype(np.float32)
+    known = (matrix, person_ids, np.einsum('ij,ij->i', matrix, matrix))
+
+    # Faces near stored encodings (matches) and unrelated faces (no match)
+    encodings = list(known_encodings[::10] + rng.normal(0, 0.02, size=(20, 128)))
+    encodings += list(rng.normal(0, 0.1, size=(20, 128)))
+
+    matches = service._match_encodings(encodings, known=known)
+
+    assert matches == baseline_match(service, encodings, known_encodings, person_ids)
+    assert any(matches[:20]) and not any(matches[20:])
+
+
+def test_new_enrollment_is_matched_without_waiting_for_cache_expiry(service, organization, monkeypatch):
+    first = np.zeros(128)
+    second = np.full(128, 0.2)
+    with get_db() as db:
+        emma = Person(name="Emma", organization_id=organization, face_encodings=[first.tolist()])
+        noah = Person(name="Noah", organization_id=organization, face_encodings=[])
+        db.add_all([emma, noah])
+        db.flush()
+        emma_id, noah_id = emma.id, noah.id
+
+    assert service._match_encodings([first, second], organization) == [emma_id, None]
+
+    monkeypatch.setattr(service, "encode_face", lambda image_data: second)
+    assert service.train_person(noah_id, [b"photo"])["success"]
+
+    assert service._match_encodings([first, second], organization) == [emma_id, noah_id]
+
+
+def test_retraining_counts_new_encodings_that_replace_pruned_ones(service, organization, monkeypatch):
+    line = np.eye(128)[0]
+    existing = [(line * step).tolist() for step in range(5)]
+    with get_db() as db:
+        person = Person(name="Emma", organization_id=organization, face_encodings=existing)
+        db.add(person)
+        db.flush()
+        person_id = person.id
+
+    # A far-away encoding displaces one of the existing evenly spaced ones
+    monkeypatch.setattr(service, "encode_face", lambda image_data: line * 10)
+    result = service.train_person(person_id, [b"photo"])
+
+    assert result["total_encodings"] == service.max_encodings_per_person
+    assert result["encodings_added"] == 1
@@ -0,0 +1,136 @@
+"""Tests for GoogleDriveService"""
+
+import pytest
+
+pytest.importorskip("googleapiclient")
+
+from app.services import google_drive
+from app.services.google_drive import GoogleDriveService
+
+
+@pytest.fixture
+def service():
+    return GoogleDriveService()
+
+
+@pytest.fixture
+def listing(service, monkeypatch):
+    """Serve list_files from a fake iter_files, counting Drive listings"""
+    calls = []
+
+    def iter_files(folder_id=None, **kwargs):
+        calls.append(folder_id)
+        return iter([{'id': f'{folder_id}-file', 'name': 'photo.jpg'}])
+
+    monkeypatch.setattr(service, "iter_files", iter_files)
+    return calls
+
+
+def test_list_files_serves_copies_from_cache(service, listing):
+    first = service.list_files(folder_id='a')
+    first[0]['name'] = 'changed.jpg'
+
+    second = service.list_files(folder_id='a')
+
+    assert listing == ['a']
+    assert second == [{'id': 'a-file', 'name': 'photo.jpg'}]
+
+
+def test_list_cache_is_bounded(service, listing):
+    service.list_cache_size = 2
+
+    for folder_id in ('a', 'b', 'c'):
+        service.list_files(folder_id=folder_id)
+
+    assert [key[0] for key in service._list_cache] == ['b', 'c']
+
+
+def test_expired_listings_are_dropped(service, listing):
+    service.list_files(folder_id='a')
+    cache_key = next(iter(service._list_cache))
+    files, _ = service._list_cache[cache_key]
+    service._list_cache[cache_key] = (files, 0)
+
+    service.list_files(folder_id='a')
+
+    assert listing == ['a', 'a']
+    assert len(service._list_cache) == 1
+
+
+class FakeRequest:
+    """Unexecuted request that times out a given number of times"""
+
+    def __init__(self, method, failures, resumable=None):
+        self.method = method
+        self.resumable = resumable
+        self.failures = failures
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TimeoutError("timed out")
+        return {'id': 'file'}
+
+
+@pytest.fixture
+def no_backoff(service, monkeypatch):
+    monkeypatch.setattr(service, "_retry_delay", lambda error, attempt: 0)
+
+
+def test_timed_out_reads_are_retried(service, no_backoff):
+    request = FakeRequest('GET', failures=2)
+
+    assert service._execute_with_retry(request) == {'id': 'file'}
+    assert request.calls == 3
+
+
+def test_timed_out_resumable_uploads_are_retried(service, no_backoff):
+    request = FakeRequest('POST', failures=1, resumable=object())
+
+    assert service._execute_with_retry(request) == {'id': 'file'}
+    assert request.calls == 2
+
+
+def test_timed_out_creates_are_not_resent(service, no_backoff):
+    request = FakeRequest('POST', failures=1)
+
+    with pytest.raises(TimeoutError):
+        service._execute_with_retry(request)
+    assert request.calls == 1
+
+
+class FakeCreds:
+    valid = True
+    expiry = None
+
+    def to_json(self):
+        return '{"token": "fake"}'
+
+
+def test_consent_flow_runs_without_holding_the_credentials_lock(tmp_path, monkeypatch):
+    credentials_path = tmp_path / "credentials.json"
+    credentials_path.write_text("{}")
+    lock_free_during_consent = []
+
+    class FakeFlow:
+        @classmethod
+        def from_client_secrets_file(cls, path, scopes):
+            return cls()
+
+        def run_local_server(self, port):
+            acquired = google_drive._creds_lock.acquire(blocking=False)
+            if acquired:
+                google_drive._creds_lock.release()
+            lock_free_during_consent.append(acquired)
+            return FakeCreds()
+
+    monkeypatch.setattr(google_drive, "InstalledAppFlow", FakeFlow)
+    monkeypatch.setattr(google_drive, "_creds_cache", {})
+    service = GoogleDriveService(credentials_path=str(credentials_path), token_path=str(tmp_path / "token.json"))
+    monkeypatch.setattr(service, "_build_service", lambda creds: object())
+
+    assert service.authenticate_user()
+    assert lock_free_during_consent == [True]
+    assert google_drive._creds_cache[service.token_path] is service.creds
+    assert (tmp_path / "token.json").read_text() == '{"token": "fake"}'
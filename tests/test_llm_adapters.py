@@ -0,0 +1,42 @@
+"""Tests for LLM adapter async client handling"""
+
+import asyncio
+
+import pytest
+
+from app.config import Config
+from app.services.llm.openai_adapter import OpenAIAdapter
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "sk-test")
+    return OpenAIAdapter()
+
+
+def test_async_client_is_reused_within_one_event_loop(adapter):
+    async def two_clients():
+        return adapter._get_async_client(), adapter._get_async_client()
+
+    first, second = asyncio.run(two_clients())
+    assert first is second
+
+
+def test_each_event_loop_gets_its_own_async_client(adapter):
+    async def client():
+        return adapter._get_async_client()
+
+    first = asyncio.run(client())
+    second = asyncio.run(client())
+
+    assert first is not second
+    # The first loop is closed, so its client was dropped
+    assert list(adapter._async_clients.values()) == [second]
+
+
+def test_chat_clients_leave_retries_to_llm_service(adapter):
+    async def client():
+        return adapter._get_async_client()
+
+    assert adapter.client.max_retries == 0
+    assert asyncio.run(client()).max_retries == 0
@@ -0,0 +1,73 @@
+"""Tests for reusing processed results across photos with identical content"""
+
+import uuid
+
+import pytest
+
+from app.database import get_db
+from app.database.models import Person, Photo
+from app.services.photo_processor import PhotoProcessor
+from app.services.storage import content_hash
+
+
+@pytest.fixture
+def processor(database, monkeypatch):
+    # Duplicate lookup never reaches the LLM, so skip building a provider client
+    monkeypatch.setattr("app.services.photo_processor.get_llm_service", lambda: None)
+    return PhotoProcessor()
+
+
+def add_photo(organization_id, url, image_data=None, person_id=None, ai_description=None):
+    photo_id = str(uuid.uuid4())
+    with get_db() as db:
+        db.add(Photo(
+            id=photo_id,
+            url=url,
+            content_hash=content_hash(image_data) if image_data is not None else None,
+            person_id=person_id,
+            ai_description=ai_description,
+            organization_id=organization_id
+        ))
+    return photo_id
+
+
+def find_duplicates(processor, photo_ids):
+    with get_db() as db:
+        rows = db.query(Photo.id, Photo.organization_id, Photo.content_hash).filter(Photo.id.in_(photo_ids)).all()
+        return processor._find_processed_duplicates(db, {row.id: row for row in rows})
+
+
+def test_identical_content_reuses_processed_result(processor, organization):
+    with get_db() as db:
+        person = Person(name="Emma", organization_id=organization)
+        db.add(person)
+        db.flush()
+        person_id = person.id
+
+    add_photo(organization, "a.jpg", b"same bytes", person_id, "Emma painting")
+    new_id = add_photo(organization, "b.jpg", b"same bytes")
+
+    assert find_duplicates(processor, [new_id]) == {new_id: (person_id, "Emma painting")}
+
+
+def test_same_url_with_different_content_is_not_a_duplicate(processor, organization):
+    url = "data:image/jpeg;base64,placeholder_IMG_0001.jpg"
+    add_photo(organization, url, b"first child", None, "Playing outside")
+    new_id = add_photo(organization, url, b"second child")
+
+    assert find_duplicates(processor, [new_id]) == {}
+
+
+def test_photos_without_content_hash_are_never_duplicates(processor, organization):
+    add_photo(organization, "drive-key", None, None, "Story time")
+    new_id = add_photo(organization, "drive-key")
+
+    assert find_duplicates(processor, [new_id]) == {}
+
+
+def test_duplicates_stay_within_organization(processor, organization):
+    other_org = str(uuid.uuid4())
+    add_photo(other_org, "a.jpg", b"same bytes", None, "Other daycare")
+    new_id = add_photo(organization, "b.jpg", b"same bytes")
+
+    assert find_duplicates(processor, [new_id]) == {}
@@ -0,0 +1,52 @@
+"""Tests for content-addressed storage"""
+
+import pytest
+
+from app.config import Config
+from app.database import get_db
+from app.database.models import Photo
+from app.services.storage import StorageService, content_hash
+
+
+@pytest.fixture
+def storage(database, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "STORAGE_TYPE", "local")
+    monkeypatch.setattr(Config, "LOCAL_STORAGE_PATH", str(tmp_path / "uploads"))
+    return StorageService()
+
+
+def add_photo(organization_id, url, image_data):
+    with get_db() as db:
+        db.add(Photo(url=url, content_hash=content_hash(image_data), organization_id=organization_id))
+
+
+def test_identical_uploads_share_one_file(storage):
+    first = storage.upload(b"image bytes", "IMG_0001.JPG")
+    second = storage.upload(b"image bytes", "other.jpg")
+
+    assert first == second
+    assert first.endswith(".jpg")
+    assert storage.download(first) == b"image bytes"
+
+
+def test_photo_file_is_kept_while_another_photo_uses_it(storage, organization):
+    key = storage.upload(b"image bytes", "a.jpg")
+    add_photo(organization, storage.get_url(key), b"image bytes")
+
+    assert storage.delete_photo_file(key, content_hash(b"image bytes"))
+    assert storage.download(key) == b"image bytes"
+
+
+def test_content_hash_is_read_from_the_file_name_when_omitted(storage, organization):
+    key = storage.upload(b"image bytes", "a.jpg")
+    add_photo(organization, storage.get_url(key), b"image bytes")
+
+    assert storage.delete_photo_file(key)
+    assert storage.download(key) == b"image bytes"
+
+
+def test_unused_photo_file_is_deleted(storage, organization):
+    key = storage.upload(b"image bytes", "a.jpg")
+
+    assert storage.delete_photo_file(key, content_hash(b"image bytes"))
+    assert not (storage.adapter.base_path / key).exists()